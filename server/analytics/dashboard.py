@@ -0,0 +1,123 @@
+# analytics/dashboard.py
+"""
+Learner dashboard payload: enrollment counts, resume cards, recent activity
+and certificates assembled in one response and cached per user.
+
+Enrollment, LessonProgress and Certificate writes drop the cached payload
+(see signals); queryset updates that bypass post_save call
+invalidate_dashboard() themselves. The timeout bounds how stale the
+recent-activity feed can get, since activity rows don't invalidate.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Avg, Count, Q
+from certificates.models import Certificate
+from courses.curriculum import get_lesson_sequences, resume_point
+from enrollments.models import Enrollment
+from .models import UserActivity
+
+RECENT_ACTIVITY_SIZE = 10
+RECENT_CERTIFICATES_SIZE = 5
+CONTINUE_LEARNING_SIZE = 4
+
+def dashboard_cache_key(user_id):
+    return f'analytics:dashboard:{user_id}'
+
+def invalidate_dashboard(user_id):
+    key = dashboard_cache_key(user_id)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
+
+def enrollment_summary(user):
+    """Enrollment counts and average progress in one conditional aggregate"""
+    summary = Enrollment.objects.filter(user=user).aggregate(
+        total_enrollments=Count('id'),
+        completed_courses=Count('id', filter=Q(is_completed=True)),
+        in_progress=Count('id', filter=Q(is_completed=False)),
+        average_progress=Avg('progress_percentage'),
+        certificates=Count('certificate'),
+    )
+    summary['average_progress'] = round(summary['average_progress'] or 0, 1)
+    return summary
+
+def recent_activity(user, limit=RECENT_ACTIVITY_SIZE):
+    activities = UserActivity.objects.filter(user=user).select_related('course').only(
+        'activity_type', 'created_at', 'course__title'
+    ).order_by('-created_at', '-id')[:limit]
+    return [
+        {
+            'activity_type': activity.activity_type,
+            'course_title': activity.course.title if activity.course else None,
+            'created_at': activity.created_at,
+        }
+        for activity in activities
+    ]
+
+def continue_learning_cards(request, user, limit):
+    """Resume cards for unfinished enrollments: one query plus one cache round trip"""
+    enrollments = list(
+        Enrollment.objects.filter(user=user, is_completed=False)
+        .exclude(status='dropped')
+        .select_related('course')
+        .only(
+            'id', 'progress_percentage', 'last_accessed_at', 'furthest_lesson',
+            'course__title', 'course__slug', 'course__thumbnail', 'course__content_version',
+        )
+        .order_by('-last_accessed_at')[:limit]
+    )
+    sequences = get_lesson_sequences({enrollment.course.id: enrollment.course.content_version for enrollment in enrollments})
+
+    cards = []
+    for enrollment in enrollments:
+        course = enrollment.course
+        sequence = sequences[course.id]
+        position, lesson = resume_point(sequence, enrollment.furthest_lesson_id)
+        cards.append({
+            'enrollment': enrollment.id,
+            'course': {
+                'id': course.id,
+                'title': course.title,
+                'slug': course.slug,
+                'thumbnail': request.build_absolute_uri(course.thumbnail.url) if course.thumbnail else None,
+            },
+            'progress_percentage': enrollment.progress_percentage,
+            'last_accessed_at': enrollment.last_accessed_at,
+            'lesson': lesson,
+            'position': position,
+            'total_lessons': len(sequence['lessons']),
+        })
+    return cards
+
+def recent_certificates(user, limit=RECENT_CERTIFICATES_SIZE):
+    certificates = Certificate.objects.filter(user=user).select_related('course').only(
+        'certificate_code', 'issued_at', 'download_url', 'verification_url', 'course__title'
+    ).order_by('-issued_at', '-id')[:limit]
+    return [
+        {
+            'id': certificate.id,
+            'certificate_code': certificate.certificate_code,
+            'course_title': certificate.course.title,
+            'issued_at': certificate.issued_at,
+            'download_url': certificate.download_url,
+            'verification_url': certificate.verification_url,
+        }
+        for certificate in certificates
+    ]
+
+def build_dashboard(request):
+    user = request.user
+    return {
+        'stats': enrollment_summary(user),
+        'continue_learning': continue_learning_cards(request, user, CONTINUE_LEARNING_SIZE),
+        'recent_activity': recent_activity(user),
+        'recent_certificates': recent_certificates(user),
+    }
+
+def get_dashboard(request):
+    key = dashboard_cache_key(request.user.id)
+    payload = cache.get(key)
+    if payload is None:
+        payload = build_dashboard(request)
+        cache.set(key, payload, settings.LEARNER_DASHBOARD_CACHE_TTL)
+    return payload
@@ -0,0 +1,191 @@
+# analytics/ingest.py
+"""
+Buffered UserActivity ingestion.
+
+record_activity() only builds an unsaved row and puts it on a bounded
+in-process queue; a daemon thread bulk_creates whatever is queued once
+ACTIVITY_BATCH_SIZE rows are waiting or ACTIVITY_FLUSH_INTERVAL seconds
+have passed. When the queue is full the caller waits up to
+ACTIVITY_QUEUE_PUT_TIMEOUT seconds (backpressure) and then the event is
+dropped and counted. A batch that fails on a transient database error is
+put back on the queue; rows failing an integrity check are rejected and
+counted. At interpreter exit the queue is drained.
+"""
+import atexit
+import logging
+import queue
+import threading
+import time
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections
+from django.utils import timezone
+from .models import UserActivity
+
+logger = logging.getLogger(__name__)
+
+class ActivityQueue:
+    def __init__(self, max_size, batch_size, flush_interval, put_timeout):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self.dropped = 0
+        self.rejected = 0
+        self._queue = queue.Queue(maxsize=max_size)
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread = None
+
+    def put(self, activity):
+        """Queue an unsaved UserActivity; returns False if it had to be dropped"""
+        self._ensure_thread()
+        try:
+            if self.put_timeout:
+                self._queue.put(activity, timeout=self.put_timeout)
+            else:
+                self._queue.put_nowait(activity)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+                dropped = self.dropped
+            # First drop and then every thousandth, so a flood doesn't flood the log too
+            if dropped == 1 or dropped % 1000 == 0:
+                logger.warning('Activity queue full, %d events dropped so far', dropped)
+            return False
+        return True
+
+    def stats(self):
+        return {'queued': self._queue.qsize(), 'dropped': self.dropped, 'rejected': self.rejected}
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            with self._lock:
+                if (self._thread is None or not self._thread.is_alive()) and not self._stopping.is_set():
+                    self._thread = threading.Thread(target=self._run, name='activity-ingest', daemon=True)
+                    self._thread.start()
+
+    def _take_batch(self):
+        """Block until a full batch is queued, the interval elapses or shutdown starts"""
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size and not self._stopping.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=min(remaining, 0.5)))
+            except queue.Empty:
+                continue
+        return batch
+
+    def _requeue(self, batch):
+        """
+        Put back events lost to a transient error. Whatever no longer fits,
+        or anything failing during shutdown, is dropped and counted.
+        """
+        lost = 0
+        for activity in batch:
+            activity.pk, activity._state.adding = None, True
+            if self._stopping.is_set():
+                lost += 1
+                continue
+            try:
+                self._queue.put_nowait(activity)
+            except queue.Full:
+                lost += 1
+        if lost:
+            with self._lock:
+                self.dropped += lost
+            logger.warning('%d activity events dropped after a failed write', lost)
+
+    def _write(self, batch):
+        """Write a batch; returns False if it failed and was put back"""
+        if not batch:
+            return True
+        close_old_connections()
+        try:
+            UserActivity.objects.bulk_create(batch, batch_size=self.batch_size)
+            return True
+        except IntegrityError:
+            # Usually a user or course deleted since the event was queued;
+            # the deferred FK check fails the whole batch at commit
+            pass
+        except Exception:
+            logger.exception('Writing %d activity events failed', len(batch))
+            self._requeue(batch)
+            return False
+
+        # Retry row by row so only the offending events are lost
+        rejected = 0
+        written = True
+        for index, activity in enumerate(batch):
+            activity.pk, activity._state.adding = None, True
+            try:
+                UserActivity.objects.bulk_create([activity])
+            except IntegrityError:
+                rejected += 1
+            except Exception:
+                logger.exception('Writing activity events row by row failed')
+                self._requeue(batch[index:])
+                written = False
+                break
+        if rejected:
+            with self._lock:
+                self.rejected += rejected
+                total = self.rejected
+            logger.warning('Activity batch hit an integrity error; %d events rejected so far', total)
+        return written
+
+    def _run(self):
+        while not self._stopping.is_set():
+            try:
+                written = self._write(self._take_batch())
+            except Exception:
+                logger.exception('Activity flusher failed')
+                written = False
+            if not written:
+                # Back off instead of spinning on a database that is down
+                self._stopping.wait(self.flush_interval)
+
+    def stop(self, timeout=10):
+        """Stop the flusher and write everything still queued"""
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        while True:
+            batch = []
+            try:
+                while len(batch) < self.batch_size:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+            self._write(batch)
+            if len(batch) < self.batch_size:
+                return
+
+activity_queue = ActivityQueue(
+    max_size=settings.ACTIVITY_QUEUE_MAX_SIZE,
+    batch_size=settings.ACTIVITY_BATCH_SIZE,
+    flush_interval=settings.ACTIVITY_FLUSH_INTERVAL,
+    put_timeout=settings.ACTIVITY_QUEUE_PUT_TIMEOUT,
+)
+
+atexit.register(activity_queue.stop)
+
+def record_activity(activity_type, user=None, course=None, request=None, **details):
+    """
+    Enqueue one UserActivity. ``user`` and ``course`` may be instances or
+    ids; ``request`` supplies the IP address and user agent.
+    """
+    activity = UserActivity(
+        activity_type=activity_type,
+        details=details,
+        created_at=timezone.now(),
+    )
+    if user is not None:
+        activity.user_id = getattr(user, 'pk', user)
+    if course is not None:
+        activity.course_id = getattr(course, 'pk', course)
+    if request is not None:
+        activity.ip_address = request.META.get('REMOTE_ADDR') or None
+        activity.user_agent = request.META.get('HTTP_USER_AGENT', '')
+    return activity_queue.put(activity)
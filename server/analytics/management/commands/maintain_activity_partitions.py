@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from analytics.partitions import apply_retention, ensure_partitions
+
+class Command(BaseCommand):
+    help = 'Create upcoming monthly UserActivity partitions and detach expired ones (run on a schedule)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--ahead', type=int, default=settings.ACTIVITY_PARTITIONS_AHEAD, help='Future months to create')
+        parser.add_argument('--keep', type=int, default=settings.ACTIVITY_RETENTION_MONTHS, help='Past months to keep attached')
+        parser.add_argument('--drop', action='store_true', default=settings.ACTIVITY_RETENTION_DROP, help='Drop expired months instead of only detaching them')
+    
+    def handle(self, *args, **options):
+        created = ensure_partitions(options['ahead'])
+        removed = apply_retention(options['keep'], drop=options['drop'])
+        action = 'dropped' if options['drop'] else 'detached'
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {len(created)} partitions ({', '.join(created) or 'none'}), "
+            f"{action} {len(removed)} ({', '.join(removed) or 'none'})"
+        ))
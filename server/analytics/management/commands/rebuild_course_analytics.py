@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from analytics.rollups import rebuild_course_analytics
+
+class Command(BaseCommand):
+    help = 'Recompute CourseAnalytics enrollment, completion, rating and revenue rollups (run on a schedule)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('course_ids', nargs='*', type=int, help='Limit to these courses (default: all)')
+    
+    def handle(self, *args, **options):
+        written = rebuild_course_analytics(options['course_ids'] or None)
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt analytics for {written} courses'))
@@ -0,0 +1,104 @@
+# Generated by Django 5.2.9 on 2026-10-18 02:38
+
+from django.conf import settings
+from django.db import migrations, models
+
+# Indexes and foreign keys as Django created them on the plain table. On the
+# partitioned parent each index is cascaded to every partition.
+INDEXES_SQL = """
+CREATE INDEX analytics_useractivity_user_id_5018049a ON analytics_useractivity (user_id);
+CREATE INDEX analytics_useractivity_course_id_0f74e282 ON analytics_useractivity (course_id);
+CREATE INDEX analytics_u_user_id_c8f3a0_idx ON analytics_useractivity (user_id, created_at DESC, id DESC);
+CREATE INDEX analytics_u_created_4e8f79_idx ON analytics_useractivity (created_at DESC, id DESC);
+ALTER TABLE analytics_useractivity ADD CONSTRAINT analytics_useractivity_user_id_5018049a_fk_user_users_id
+    FOREIGN KEY (user_id) REFERENCES user_users (id) DEFERRABLE INITIALLY DEFERRED;
+ALTER TABLE analytics_useractivity ADD CONSTRAINT analytics_useractivity_course_id_0f74e282_fk_courses_course_id
+    FOREIGN KEY (course_id) REFERENCES courses_course (id) DEFERRABLE INITIALLY DEFERRED;
+"""
+
+# The partition key has to be part of the primary key, so it becomes
+# (id, created_at); ids still come from one sequence. Existing months get a
+# partition each, plus the next three, and a default partition catches the
+# rest until analytics.partitions.ensure_partitions() adds their month.
+PARTITION_SQL = """
+ALTER TABLE analytics_useractivity RENAME TO analytics_useractivity_old;
+ALTER INDEX analytics_useractivity_pkey RENAME TO analytics_useractivity_old_pkey;
+
+CREATE TABLE analytics_useractivity (
+    id bigint NOT NULL,
+    user_id bigint NULL,
+    activity_type varchar(50) NOT NULL,
+    course_id bigint NULL,
+    details jsonb NOT NULL,
+    ip_address inet NULL,
+    user_agent text NOT NULL,
+    created_at timestamp with time zone NOT NULL,
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+CREATE TABLE analytics_useractivity_default PARTITION OF analytics_useractivity DEFAULT;
+
+DO $$
+DECLARE
+    month timestamp := date_trunc('month', COALESCE((SELECT MIN(created_at) FROM analytics_useractivity_old), now()) AT TIME ZONE 'UTC');
+    stop timestamp := date_trunc('month', now() AT TIME ZONE 'UTC') + interval '4 months';
+BEGIN
+    WHILE month < stop LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF analytics_useractivity FOR VALUES FROM (%L) TO (%L)',
+            'analytics_useractivity_p' || to_char(month, 'YYYYMM'),
+            month AT TIME ZONE 'UTC',
+            (month + interval '1 month') AT TIME ZONE 'UTC'
+        );
+        month := month + interval '1 month';
+    END LOOP;
+END $$;
+
+INSERT INTO analytics_useractivity (id, user_id, activity_type, course_id, details, ip_address, user_agent, created_at)
+SELECT id, user_id, activity_type, course_id, details, ip_address, user_agent, created_at FROM analytics_useractivity_old;
+
+DROP TABLE analytics_useractivity_old;
+
+CREATE SEQUENCE analytics_useractivity_id_seq OWNED BY analytics_useractivity.id;
+SELECT setval('analytics_useractivity_id_seq', COALESCE(MAX(id), 0) + 1, false) FROM analytics_useractivity;
+ALTER TABLE analytics_useractivity ALTER COLUMN id SET DEFAULT nextval('analytics_useractivity_id_seq');
+""" + INDEXES_SQL
+
+# Back to one plain table. Partitions already detached for retention are
+# separate tables by then and are left alone.
+UNPARTITION_SQL = """
+CREATE TABLE analytics_useractivity_plain (
+    id bigint NOT NULL GENERATED BY DEFAULT AS IDENTITY,
+    user_id bigint NULL,
+    activity_type varchar(50) NOT NULL,
+    course_id bigint NULL,
+    details jsonb NOT NULL,
+    ip_address inet NULL,
+    user_agent text NOT NULL,
+    created_at timestamp with time zone NOT NULL
+);
+
+INSERT INTO analytics_useractivity_plain (id, user_id, activity_type, course_id, details, ip_address, user_agent, created_at)
+SELECT id, user_id, activity_type, course_id, details, ip_address, user_agent, created_at FROM analytics_useractivity;
+
+DROP TABLE analytics_useractivity;
+ALTER TABLE analytics_useractivity_plain RENAME TO analytics_useractivity;
+ALTER TABLE analytics_useractivity ADD CONSTRAINT analytics_useractivity_pkey PRIMARY KEY (id);
+SELECT setval(pg_get_serial_sequence('analytics_useractivity', 'id'), COALESCE(MAX(id), 0) + 1, false) FROM analytics_useractivity;
+""" + INDEXES_SQL
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0003_useractivity_created_at_default'),
+        ('courses', '0008_course_required_lessons'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunSQL(PARTITION_SQL, UNPARTITION_SQL),
+        migrations.AddIndex(
+            model_name='useractivity',
+            index=models.Index(fields=['activity_type', 'created_at'], name='analytics_u_activit_2317fd_idx'),
+        ),
+    ]
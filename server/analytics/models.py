@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 from user.models import Users
 from courses.models import Course
 
@@ -21,11 +22,21 @@ class UserActivity(models.Model):
     details = models.JSONField(default=dict)  # Store additional data
     ip_address = models.GenericIPAddressField(null=True, blank=True)
     user_agent = models.TextField(blank=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    # Set when the event is recorded, not when the buffered row is flushed
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
     
     class Meta:
+        # Range-partitioned by month on created_at (see partitions.py); in the
+        # database the primary key is (id, created_at) and ids stay unique
         ordering = ['-created_at']
         verbose_name_plural = 'User Activities'
+        indexes = [
+            # Also serves (user, created_at) lookups and ranges (scanned
+            # backwards); don't add a separate index for them
+            models.Index(fields=['user', '-created_at', '-id']),
+            models.Index(fields=['-created_at', '-id']),
+            models.Index(fields=['activity_type', 'created_at']),
+        ]
     
     def __str__(self):
         return f"{self.activity_type} - {self.user.username if self.user else 'Anonymous'}"
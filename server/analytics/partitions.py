@@ -0,0 +1,102 @@
+# analytics/partitions.py
+"""
+Monthly range partitions of UserActivity on created_at.
+
+Each calendar month (UTC) lives in its own partition named
+<table>_pYYYYMM; a default partition catches rows for months that don't
+have one yet, so an insert never fails. Indexes are declared on the
+parent, so Postgres builds them on every partition. Retention detaches
+(and optionally drops) whole months instead of deleting rows.
+"""
+import re
+from datetime import datetime, timezone as dt_timezone
+from django.db import connection, transaction
+from django.utils import timezone
+from .models import UserActivity
+
+PARTITION_NAME_RE = re.compile(r'_p(\d{4})(\d{2})$')
+
+def month_start(value, offset=0):
+    """First instant (UTC) of the month ``offset`` months after the one holding ``value``"""
+    value = value.astimezone(dt_timezone.utc)
+    index = value.year * 12 + value.month - 1 + offset
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=dt_timezone.utc)
+
+def partition_name(month):
+    return f'{UserActivity._meta.db_table}_p{month:%Y%m}'
+
+def list_partitions():
+    """Attached monthly partitions as {month start: table name}"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid '
+            'WHERE i.inhparent = %s::regclass',
+            [UserActivity._meta.db_table],
+        )
+        names = [name for name, in cursor.fetchall()]
+    partitions = {}
+    for name in names:
+        match = PARTITION_NAME_RE.search(name)
+        if match:
+            partitions[datetime(int(match[1]), int(match[2]), 1, tzinfo=dt_timezone.utc)] = name
+    return partitions
+
+def ensure_partitions(months_ahead):
+    """
+    Create any missing partitions from the current month through
+    ``months_ahead`` months out. Rows the default partition already holds
+    for a new month are moved into it before it is attached. Returns the
+    names created.
+    """
+    table = UserActivity._meta.db_table
+    default = f'{table}_default'
+    existing = list_partitions()
+    now = timezone.now()
+
+    created = []
+    for offset in range(months_ahead + 1):
+        start = month_start(now, offset)
+        if start in existing:
+            continue
+        end = month_start(start, 1)
+        name = partition_name(start)
+        with transaction.atomic(), connection.cursor() as cursor:
+            # Hold off inserts into the default partition until the move and
+            # attach commit, or rows written in between are stranded there
+            # and the attach fails its constraint check
+            cursor.execute(f'LOCK TABLE {default} IN SHARE ROW EXCLUSIVE MODE')
+            cursor.execute(f'CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS)')
+            cursor.execute(
+                f'WITH moved AS (DELETE FROM {default} WHERE created_at >= %s AND created_at < %s RETURNING *) '
+                f'INSERT INTO {name} SELECT * FROM moved',
+                [start, end],
+            )
+            cursor.execute(f'ALTER TABLE {table} ATTACH PARTITION {name} FOR VALUES FROM (%s) TO (%s)', [start, end])
+        created.append(name)
+    return created
+
+def apply_retention(keep_months, drop=False):
+    """
+    Detach the monthly partitions that end before the retention window (the
+    current month and the ``keep_months`` before it). Detached months stay
+    behind as plain tables for archiving unless ``drop`` is set. Returns the
+    names detached.
+    """
+    table = UserActivity._meta.db_table
+    cutoff = month_start(timezone.now(), -keep_months)
+
+    removed = []
+    for start, name in sorted(list_partitions().items()):
+        if start >= cutoff:
+            break
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f'ALTER TABLE {table} DETACH PARTITION {name}')
+            if drop:
+                cursor.execute(f'DROP TABLE {name}')
+            else:
+                # Archived months must not block deleting the users and courses they mention
+                cursor.execute("SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'f'", [name])
+                for constraint, in cursor.fetchall():
+                    cursor.execute(f'ALTER TABLE {name} DROP CONSTRAINT {connection.ops.quote_name(constraint)}')
+        removed.append(name)
+    return removed
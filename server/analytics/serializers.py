@@ -0,0 +1,28 @@
+from datetime import timedelta
+from django.utils import timezone
+from rest_framework import serializers
+from .models import UserActivity
+from .trends import GRANULARITIES, GRANULARITY_DAYS, MAX_BUCKETS
+
+class UserActivitySerializer(serializers.ModelSerializer):
+    course_title = serializers.CharField(source='course.title', read_only=True, default=None)
+    
+    class Meta:
+        model = UserActivity
+        fields = ['id', 'user', 'activity_type', 'course', 'course_title', 'details', 'created_at']
+        read_only_fields = fields
+
+class AnalyticsRangeSerializer(serializers.Serializer):
+    """?start=&end= (inclusive dates, default the last 30 days) and ?granularity="""
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+    granularity = serializers.ChoiceField(choices=list(GRANULARITIES), default='day')
+    
+    def validate(self, data):
+        data['end'] = data.get('end') or timezone.now().date()
+        data['start'] = data.get('start') or data['end'] - timedelta(days=30)
+        if data['start'] > data['end']:
+            raise serializers.ValidationError('start must not be after end.')
+        if (data['end'] - data['start']).days // GRANULARITY_DAYS[data['granularity']] > MAX_BUCKETS:
+            raise serializers.ValidationError(f'Range spans more than {MAX_BUCKETS} {data["granularity"]} buckets.')
+        return data
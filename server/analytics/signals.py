@@ -0,0 +1,20 @@
+# analytics/signals.py
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from certificates.models import Certificate
+from enrollments.models import Enrollment, LessonProgress
+from .dashboard import invalidate_dashboard
+
+@receiver(post_save, sender=Enrollment)
+@receiver(post_delete, sender=Enrollment)
+@receiver(post_save, sender=Certificate)
+@receiver(post_delete, sender=Certificate)
+def invalidate_dashboard_for_user_row(sender, instance, **kwargs):
+    invalidate_dashboard(instance.user_id)
+
+@receiver(post_save, sender=LessonProgress)
+@receiver(post_delete, sender=LessonProgress)
+def invalidate_dashboard_for_progress(sender, instance, **kwargs):
+    user_id = Enrollment.objects.filter(pk=instance.enrollment_id).values_list('user_id', flat=True).first()
+    if user_id is not None:
+        invalidate_dashboard(user_id)
@@ -0,0 +1,81 @@
+# analytics/trends.py
+"""
+Time-bucketed admin series. Each series is one statement: generate_series
+supplies every bucket in the range (so empty periods still appear), and
+the rows are grouped once per bucket instead of counted per day.
+Buckets are UTC, like the rest of the stored timestamps.
+"""
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+from django.db import connection
+from user.models import Users
+from .models import UserActivity
+
+GRANULARITIES = {
+    'day': '1 day',
+    'week': '1 week',
+    'month': '1 month',
+}
+
+# Rough bucket width in days, used to cap the number of buckets per request
+GRANULARITY_DAYS = {'day': 1, 'week': 7, 'month': 28}
+MAX_BUCKETS = 1000
+
+def _range_params(start, end, granularity):
+    """Bind parameters shared by every series: [start, end] as whole UTC days"""
+    return {
+        'unit': granularity,
+        'step': GRANULARITIES[granularity],
+        'start': datetime.combine(start, time.min, tzinfo=dt_timezone.utc),
+        'last': datetime.combine(end, time.min, tzinfo=dt_timezone.utc),
+        'end': datetime.combine(end + timedelta(days=1), time.min, tzinfo=dt_timezone.utc),
+    }
+
+SERIES_SQL = (
+    'SELECT generate_series(date_trunc(%(unit)s, %(start)s::timestamptz), '
+    'date_trunc(%(unit)s, %(last)s::timestamptz), %(step)s::interval) AS bucket'
+)
+
+def user_growth(start, end, granularity):
+    """New sign-ups per bucket plus the running total of users at the end of each bucket"""
+    users = Users._meta.db_table
+    sql = (
+        f'WITH series AS ({SERIES_SQL}), '
+        f'joined AS ('
+        f'SELECT date_trunc(%(unit)s, date_joined) AS bucket, COUNT(*) AS n FROM {users} '
+        f'WHERE date_joined >= date_trunc(%(unit)s, %(start)s::timestamptz) AND date_joined < %(end)s '
+        f'GROUP BY 1) '
+        f'SELECT s.bucket, COALESCE(j.n, 0), '
+        f'(SELECT COUNT(*) FROM {users} WHERE date_joined < date_trunc(%(unit)s, %(start)s::timestamptz)) '
+        f'+ SUM(COALESCE(j.n, 0)) OVER (ORDER BY s.bucket) '
+        f'FROM series s LEFT JOIN joined j ON j.bucket = s.bucket '
+        f'ORDER BY s.bucket'
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, _range_params(start, end, granularity))
+        return [
+            {'date': bucket.date().isoformat(), 'new_users': new_users, 'users': int(total)}
+            for bucket, new_users, total in cursor.fetchall()
+        ]
+
+def activity_trends(start, end, granularity):
+    """Activity count per bucket, total and by activity type"""
+    activities = UserActivity._meta.db_table
+    sql = (
+        f'WITH series AS ({SERIES_SQL}), '
+        f'counts AS ('
+        f'SELECT date_trunc(%(unit)s, created_at) AS bucket, activity_type, COUNT(*) AS n FROM {activities} '
+        f'WHERE created_at >= date_trunc(%(unit)s, %(start)s::timestamptz) AND created_at < %(end)s '
+        f'GROUP BY 1, 2) '
+        f'SELECT s.bucket, c.activity_type, c.n '
+        f'FROM series s LEFT JOIN counts c ON c.bucket = s.bucket '
+        f'ORDER BY s.bucket'
+    )
+    trends = {}
+    with connection.cursor() as cursor:
+        cursor.execute(sql, _range_params(start, end, granularity))
+        for bucket, activity_type, count in cursor.fetchall():
+            point = trends.setdefault(bucket, {'date': bucket.date().isoformat(), 'activities': 0, 'by_type': {}})
+            if activity_type is not None:
+                point['activities'] += count
+                point['by_type'][activity_type] = count
+    return list(trends.values())
@@ -4,6 +4,7 @@ from . import views
 
 router = DefaultRouter()
 router.register(r'analytics', views.AnalyticsViewSet, basename='analytics')
+router.register(r'activities', views.UserActivityViewSet, basename='activity')
 
 urlpatterns = [
     path('', include(router.urls)),
@@ -1,14 +1,37 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
-from django.db.models import Count, Sum, Avg, Q
+from django_filters.rest_framework import DjangoFilterBackend
+from django.db.models import Count, Sum, Q, Case, F, FloatField, Value, When
 from datetime import datetime, timedelta
+from core.pagination import CreatedAtKeysetPagination
+from .dashboard import enrollment_summary, get_dashboard, recent_activity
 from .models import UserActivity, CourseAnalytics, SystemAnalytics
+from .rollups import COURSE_ANALYTICS_ORDERINGS
+from .serializers import UserActivitySerializer, AnalyticsRangeSerializer
+from .trends import activity_trends, user_growth
 from courses.models import Course
 from enrollments.models import Enrollment
 from user.models import Users
 
+class UserActivityViewSet(viewsets.ReadOnlyModelViewSet):
+    serializer_class = UserActivitySerializer
+    permission_classes = [IsAuthenticated]
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['activity_type', 'course']
+    pagination_class = CreatedAtKeysetPagination
+    
+    def get_queryset(self):
+        # Users see their own activity, admins see everyone's
+        queryset = UserActivity.objects.select_related('course').only(
+            'id', 'user', 'activity_type', 'course', 'course__title', 'details', 'created_at'
+        )
+        if self.request.user.is_staff:
+            return queryset
+        return queryset.filter(user=self.request.user)
+
 class AnalyticsViewSet(viewsets.ViewSet):
     permission_classes = [IsAuthenticated]
     
@@ -20,66 +43,66 @@ class AnalyticsViewSet(viewsets.ViewSet):
     @action(detail=False, methods=['get'])
     def user_stats(self, request):
         """Get current user's learning statistics"""
-        user = request.user
-        
-        # Get user's enrollments
-        user_enrollments = Enrollment.objects.filter(user=user)
-        
-        total_enrollments = user_enrollments.count()
-        completed_courses = user_enrollments.filter(is_completed=True).count()
-        in_progress = user_enrollments.filter(is_completed=False).count()
-        
-        # Calculate average progress
-        avg_progress = user_enrollments.aggregate(avg=Avg('progress_percentage'))['avg'] or 0
-        
-        # Get recent activity
-        recent_activity = UserActivity.objects.filter(user=user).order_by('-created_at')[:10]
-        
-        return Response({
-            'total_enrollments': total_enrollments,
-            'completed_courses': completed_courses,
-            'in_progress': in_progress,
-            'average_progress': round(avg_progress, 1),
-            'recent_activity': [
-                {
-                    'activity_type': activity.activity_type,
-                    'course_title': activity.course.title if activity.course else None,
-                    'created_at': activity.created_at
-                }
-                for activity in recent_activity
-            ]
-        })
+        stats = enrollment_summary(request.user)
+        stats.pop('certificates')
+        stats['recent_activity'] = recent_activity(request.user)
+        return Response(stats)
+    
+    @action(detail=False, methods=['get'])
+    def dashboard(self, request):
+        """Stats, resume cards, recent activity and certificates in one cached payload"""
+        return Response(get_dashboard(request))
     
     @action(detail=False, methods=['get'])
     def course_analytics(self, request):
-        """Get analytics for all courses (admin only)"""
+        """
+        Get analytics for all courses (admin only), read from the
+        CourseAnalytics rollups. Sort with ?ordering=[-]enrollments,
+        completions, completion_rate, revenue, rating, reviews or title.
+        The rollups are rebuilt by the rebuild_course_analytics command.
+        """
         if not request.user.is_staff:
             return Response(
                 {'detail': 'Admin access required.'},
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        courses = Course.objects.all()
-        analytics = []
-        
-        for course in courses:
-            enrollments = Enrollment.objects.filter(course=course)
-            total_enrollments = enrollments.count()
-            completions = enrollments.filter(is_completed=True).count()
-            completion_rate = (completions / total_enrollments * 100) if total_enrollments > 0 else 0
-            
-            analytics.append({
-                'course_id': course.id,
-                'course_title': course.title,
-                'total_enrollments': total_enrollments,
-                'completions': completions,
-                'completion_rate': round(completion_rate, 1),
-                'average_rating': course.average_rating,
-                'total_reviews': course.total_reviews,
-                'revenue': float(course.price) * total_enrollments if not course.is_free else 0
-            })
+        ordering = request.query_params.get('ordering', '-enrollments')
+        field = COURSE_ANALYTICS_ORDERINGS.get(ordering.lstrip('-'))
+        if field is None:
+            return Response(
+                {'detail': f"Unknown ordering. Use one of: {', '.join(COURSE_ANALYTICS_ORDERINGS)}."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
-        return Response(analytics)
+        order = F(field).desc() if ordering.startswith('-') else F(field).asc()
+        rollups = CourseAnalytics.objects.select_related('course').only(
+            'course__title', 'total_enrollments', 'total_completions', 'average_rating',
+            'total_ratings', 'total_revenue', 'last_updated',
+        ).annotate(
+            completion_rate=Case(
+                When(total_enrollments__gt=0, then=F('total_completions') * 100.0 / F('total_enrollments')),
+                default=Value(0.0),
+                output_field=FloatField(),
+            )
+        ).order_by(order, 'course_id')
+        
+        paginator = PageNumberPagination()
+        page = paginator.paginate_queryset(rollups, request, view=self)
+        return paginator.get_paginated_response([
+            {
+                'course_id': rollup.course_id,
+                'course_title': rollup.course.title,
+                'total_enrollments': rollup.total_enrollments,
+                'completions': rollup.total_completions,
+                'completion_rate': round(rollup.completion_rate, 1),
+                'average_rating': rollup.average_rating,
+                'total_reviews': rollup.total_ratings,
+                'revenue': float(rollup.total_revenue),
+                'last_updated': rollup.last_updated,
+            }
+            for rollup in page
+        ])
     
     @action(detail=False, methods=['get'])
     def system_stats(self, request):
@@ -138,36 +161,21 @@ class AnalyticsViewSet(viewsets.ViewSet):
     
     @action(detail=False, methods=['get'])
     def user_analytics(self, request):
-        """Get user analytics (admin only)"""
+        """Get user growth and activity trends (admin only); see AnalyticsRangeSerializer for params"""
         if not request.user.is_staff:
             return Response(
                 {'detail': 'Admin access required.'},
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        # Get user growth data for last 30 days
-        thirty_days_ago = datetime.now() - timedelta(days=30)
-        dates = [(thirty_days_ago + timedelta(days=i)).date() for i in range(31)]
-        
-        user_growth = []
-        for date in dates:
-            count = Users.objects.filter(date_joined__date__lte=date).count()
-            user_growth.append({
-                'date': date.isoformat(),
-                'users': count
-            })
-        
-        # Get user activity by day for last 7 days
-        activity_data = []
-        for i in range(7):
-            date = (datetime.now() - timedelta(days=i)).date()
-            activities = UserActivity.objects.filter(created_at__date=date).count()
-            activity_data.append({
-                'date': date.isoformat(),
-                'activities': activities
-            })
+        serializer = AnalyticsRangeSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        start, end, granularity = (serializer.validated_data[key] for key in ('start', 'end', 'granularity'))
         
         return Response({
-            'user_growth': user_growth,
-            'activity_trends': activity_data
-        })
\ No newline at end of file
+            'start': start,
+            'end': end,
+            'granularity': granularity,
+            'user_growth': user_growth(start, end, granularity),
+            'activity_trends': activity_trends(start, end, granularity)
+        })
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.9 on 2026-10-18 02:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('certificates', '0001_initial'),
+        ('courses', '0007_keyset_indexes'),
+        ('enrollments', '0003_keyset_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='certificate',
+            index=models.Index(fields=['user', '-issued_at', '-id'], name='certificate_user_id_3400d2_idx'),
+        ),
+    ]
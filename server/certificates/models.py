@@ -17,6 +17,9 @@ class Certificate(models.Model):
     class Meta:
         unique_together = ['user', 'course']
         ordering = ['-issued_at']
+        indexes = [
+            models.Index(fields=['user', '-issued_at', '-id']),
+        ]
     
     def __str__(self):
         return f"Certificate {self.certificate_code} - {self.user.username} - {self.course.title}"
@@ -4,6 +4,8 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
 from django.shortcuts import get_object_or_404
+from analytics.ingest import record_activity
+from core.pagination import IssuedAtKeysetPagination
 from .models import Certificate
 from .serializers import CertificateSerializer, GenerateCertificateSerializer
 from enrollments.models import Enrollment
@@ -14,6 +16,7 @@ class CertificateViewSet(viewsets.ModelViewSet):
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
     filterset_fields = ['course']
     search_fields = ['course__title']
+    pagination_class = IssuedAtKeysetPagination
     
     def get_queryset(self):
         if self.request.user.is_staff:
@@ -34,6 +37,7 @@ class CertificateViewSet(viewsets.ModelViewSet):
                 course=enrollment.course,
                 enrollment=enrollment
             )
+            record_activity('certificate_generated', user=request.user, course=enrollment.course_id, request=request)
             
             return Response(
                 CertificateSerializer(certificate).data,
@@ -111,6 +111,33 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Cache
+# Redis in deployed environments, per-process memory otherwise
+REDIS_URL = os.getenv('REDIS_URL')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django_redis.cache.RedisCache',
+            'LOCATION': REDIS_URL,
+            'OPTIONS': {
+                'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+            },
+            'KEY_PREFIX': 'smartclass',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'smartclass',
+        }
+    }
+
+# Image variants
+IMAGE_VARIANT_WIDTHS = [160, 320, 640, 1280]  # ascending
+IMAGE_VARIANT_WORKERS = int(os.getenv('IMAGE_VARIANT_WORKERS', 2))
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -201,7 +228,8 @@ REST_FRAMEWORK = {
     ],
     'DEFAULT_THROTTLE_RATES': {
         'anon': '100/day',
-        'user': '1000/day'
+        'user': '1000/day',
+        'autocomplete': '120/minute',
     }
 }
 
@@ -238,6 +266,43 @@ STRIPE_SECRET_KEY = os.getenv('STRIPE_SECRET_KEY', '')
 STRIPE_PUBLISHABLE_KEY = os.getenv('STRIPE_PUBLISHABLE_KEY', '')
 STRIPE_WEBHOOK_SECRET = os.getenv('STRIPE_WEBHOOK_SECRET', '')
 
+# Course typeahead
+COURSE_AUTOCOMPLETE_LIMIT = 8
+COURSE_AUTOCOMPLETE_CACHE_TTL = 60  # seconds
+
+# Catalog facets
+COURSE_FACETS_CACHE_TTL = 300  # seconds, per normalized filter set
+
+# Course recommendations
+COURSE_RECOMMENDATION_NEIGHBOURS = 20  # top-K similar courses stored per course
+
+# Enrollment counters
+ENROLLMENT_COUNTER_SHARDS = 16  # upsert targets per course; fold_enrollment_counters drains them
+
+# Quizzes
+QUIZ_TIME_LIMIT_GRACE = 30  # seconds allowed past Quiz.time_limit for network latency
+
+# Learner dashboard
+LEARNER_DASHBOARD_CACHE_TTL = 300  # also bounds recent-activity staleness
+
+# Activity ingestion
+ACTIVITY_QUEUE_MAX_SIZE = 10000  # events buffered per process
+ACTIVITY_BATCH_SIZE = 500  # rows per bulk INSERT
+ACTIVITY_FLUSH_INTERVAL = 5  # seconds before a partial batch is written
+ACTIVITY_QUEUE_PUT_TIMEOUT = 0.05  # seconds a request waits on a full queue before dropping; 0 drops at once
+
+# Activity partitions
+ACTIVITY_PARTITIONS_AHEAD = 3  # future monthly partitions kept ready
+ACTIVITY_RETENTION_MONTHS = 24  # whole months kept before the current one
+ACTIVITY_RETENTION_DROP = False  # detach expired months for archiving instead of dropping them
+
+# Lesson heartbeats
+LESSON_HEARTBEAT_FLUSH_INTERVAL = 15  # seconds between buffered time_spent writes
+LESSON_HEARTBEAT_MAX_PENDING = 5000  # (enrollment, lesson) pairs buffered before an early flush
+LESSON_HEARTBEAT_MAX_DELTA = 120  # seconds credited per event at most
+LESSON_HEARTBEAT_MAX_EVENTS = 50  # events accepted per request
+LESSON_HEARTBEAT_MAX_REQUEST_SECONDS = 300  # seconds credited per request at most, across all events
+
 # Email settings
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'  # Default for dev
 EMAIL_HOST = os.getenv('EMAIL_HOST', '')
@@ -0,0 +1,33 @@
+# core/fields.py
+from rest_framework import serializers
+from .images import digest_field_name, variant_names
+
+class ImageVariantsField(serializers.ReadOnlyField):
+    """
+    URLs of the resized variants of an image field, grouped by format and
+    width: ``{"webp": {"320": url, ...}, "jpg": {...}}``. Until the variants
+    of the current upload exist every width points at the original. Takes
+    the image field's name; querysets using only() must load
+    ``<field>_digest`` too.
+    """
+
+    def __init__(self, image_field, **kwargs):
+        self.image_field = image_field
+        kwargs['source'] = '*'
+        super().__init__(**kwargs)
+
+    def to_representation(self, instance):
+        value = getattr(instance, self.image_field)
+        if not value:
+            return None
+        request = self.context.get('request')
+        digest = getattr(instance, digest_field_name(self.image_field))
+        original = value.storage.url(value.name)
+        variants = {}
+        for extension, names in variant_names(value.name, digest).items():
+            urls = {}
+            for width, name in names.items():
+                url = value.storage.url(name) if digest else original
+                urls[str(width)] = request.build_absolute_uri(url) if request else url
+            variants[extension] = urls
+        return variants
@@ -0,0 +1,124 @@
+# core/images.py
+"""
+Resized, compressed derivatives of uploaded images.
+
+Variants live next to the original under a ``variants/`` directory with
+names derived from the original's name and a digest of its content, so a
+storage that overwrites an upload in place (S3) never serves the old
+image's variants. The digest is recorded on the model in
+``<field>_digest`` once every variant is written; until then it is empty
+and serializers fall back to the original. Recording it bumps
+``updated_at`` so conditional GETs see the new variants, and sends
+``variants_recorded`` for caches keyed on anything else. Generation goes through
+``field.storage`` only, which keeps it working on both FileSystemStorage
+and django-storages.
+"""
+import hashlib
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections
+from django.db.models.functions import Now
+from django.dispatch import Signal
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+# Sent with sender=model and field_name once rows point at new variants
+variants_recorded = Signal()
+
+# (format, extension, save options)
+VARIANT_FORMATS = [
+    ('WEBP', 'webp', {'quality': 80, 'method': 6}),
+    ('JPEG', 'jpg', {'quality': 82, 'optimize': True, 'progressive': True}),
+]
+
+_executor = ThreadPoolExecutor(
+    max_workers=settings.IMAGE_VARIANT_WORKERS,
+    thread_name_prefix='image-variants',
+)
+
+def digest_field_name(field_name):
+    return f'{field_name}_digest'
+
+def variant_name(name, digest, width, extension):
+    directory, filename = os.path.split(name)
+    stem = os.path.splitext(filename)[0]
+    return os.path.join(directory, 'variants', f'{stem}_{digest}_{width}w.{extension}')
+
+def variant_names(name, digest):
+    """{extension: {width: storage name}} for every configured variant"""
+    return {
+        extension: {width: variant_name(name, digest, width, extension) for width in settings.IMAGE_VARIANT_WIDTHS}
+        for _, extension, _ in VARIANT_FORMATS
+    }
+
+def generate_variants(storage, name, current=None, force=False):
+    """
+    Render every width/format of ``name`` and return the content digest
+    they are keyed by. Nothing is rendered when ``current`` already matches
+    the content, or when the variants for this content exist, unless
+    ``force``.
+    """
+    with storage.open(name, 'rb') as original:
+        data = original.read()
+    digest = hashlib.sha256(data).hexdigest()[:16]
+
+    widths = settings.IMAGE_VARIANT_WIDTHS
+    last = variant_name(name, digest, widths[-1], VARIANT_FORMATS[-1][1])
+    if not force and (digest == current or storage.exists(last)):
+        return digest
+
+    image = Image.open(BytesIO(data))
+    image.load()
+    image = ImageOps.exif_transpose(image)
+
+    for width in widths:
+        # Bound by width only and never upscale
+        variant = image.copy()
+        variant.thumbnail((width, image.height), Image.LANCZOS)
+        for image_format, extension, options in VARIANT_FORMATS:
+            rendered = variant
+            if image_format == 'JPEG' and rendered.mode not in ('RGB', 'L'):
+                rendered = rendered.convert('RGB')
+            elif rendered.mode not in ('RGB', 'RGBA', 'L'):
+                rendered = rendered.convert('RGBA')
+            buffer = BytesIO()
+            rendered.save(buffer, image_format, **options)
+
+            target = variant_name(name, digest, width, extension)
+            # FileSystemStorage would pick a new name instead of overwriting
+            if storage.exists(target):
+                storage.delete(target)
+            storage.save(target, ContentFile(buffer.getvalue()))
+    return digest
+
+def record_variants(model, field_name, name, digest):
+    """Point every row still holding ``name`` at the variants for ``digest``"""
+    updated = model._default_manager.filter(**{field_name: name}).exclude(
+        **{digest_field_name(field_name): digest}
+    ).update(**{digest_field_name(field_name): digest, 'updated_at': Now()})
+    if updated:
+        variants_recorded.send(sender=model, field_name=field_name)
+    return updated
+
+def _generate_safely(model, field_name, storage, name, current):
+    try:
+        digest = generate_variants(storage, name, current)
+        if digest != current:
+            close_old_connections()
+            record_variants(model, field_name, name, digest)
+    except Exception:
+        logger.exception('Image variant generation failed for %s', name)
+
+def schedule_variants(fieldfile):
+    """Queue variant generation for an image field value on the worker pool"""
+    if fieldfile:
+        field_name = fieldfile.field.name
+        current = getattr(fieldfile.instance, digest_field_name(field_name))
+        _executor.submit(
+            _generate_safely, type(fieldfile.instance), field_name, fieldfile.storage, fieldfile.name, current,
+        )
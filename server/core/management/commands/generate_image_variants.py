@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from core.images import digest_field_name, generate_variants, record_variants
+from core.signals import IMAGE_FIELDS
+
+class Command(BaseCommand):
+    help = 'Backfill resized WebP/JPEG variants for existing course thumbnails, profile pictures and logos'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Regenerate variants that already exist')
+    
+    def handle(self, *args, **options):
+        generated = 0
+        for model, field_name in IMAGE_FIELDS.items():
+            images = model.objects.exclude(**{field_name: ''}).exclude(**{f'{field_name}__isnull': True}).values_list(
+                field_name, digest_field_name(field_name)
+            )
+            storage = model._meta.get_field(field_name).storage
+            for name, current in images.iterator():
+                try:
+                    digest = generate_variants(storage, name, current, force=options['force'])
+                    if digest != current:
+                        record_variants(model, field_name, name, digest)
+                        generated += 1
+                except Exception as exc:
+                    self.stderr.write(f'{model._meta.label} {name}: {exc}')
+        self.stdout.write(self.style.SUCCESS(f'Generated variants for {generated} images'))
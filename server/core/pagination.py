@@ -0,0 +1,60 @@
+# core/pagination.py
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Keyset (cursor) pagination over ``ordering``: every page is one indexed
+    range scan with no COUNT(*) or OFFSET, so deep pages cost the same as
+    the first.
+
+    Clients opt in with ``?pagination=cursor`` and then follow the ``next``
+    and ``previous`` links. Requests without it keep the page-number
+    response shape, so existing callers still get ``count``.
+    """
+    mode_query_param = 'pagination'
+    fallback_class = PageNumberPagination
+    fallback = None
+
+    def use_cursor(self, request):
+        return (
+            request.query_params.get(self.mode_query_param) == 'cursor'
+            or self.cursor_query_param in request.query_params
+        )
+
+    def get_ordering(self, request, queryset, view):
+        ordering = tuple(super().get_ordering(request, queryset, view))
+        # A client ?ordering= replaces ours and need not be unique; without an
+        # id tiebreak, rows sharing a key can repeat or vanish across pages
+        if 'id' not in ordering and '-id' not in ordering:
+            ordering += ('-id',)
+        return ordering
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.use_cursor(request):
+            self.fallback = None
+            return super().paginate_queryset(queryset, request, view)
+        self.fallback = self.fallback_class()
+        return self.fallback.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.fallback is not None:
+            return self.fallback.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_html_context(self):
+        if self.fallback is not None:
+            return self.fallback.get_html_context()
+        return super().get_html_context()
+
+
+class CreatedAtKeysetPagination(KeysetPagination):
+    ordering = ('-created_at', '-id')
+
+
+class EnrolledAtKeysetPagination(KeysetPagination):
+    ordering = ('-enrolled_at', '-id')
+
+
+class IssuedAtKeysetPagination(KeysetPagination):
+    ordering = ('-issued_at', '-id')
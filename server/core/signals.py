@@ -0,0 +1,48 @@
+# core/signals.py
+from django.db import transaction
+from django.db.models.signals import post_init, post_save, pre_save
+from courses.models import Course
+from organization.models import Organization
+from user.models import Users
+from .images import digest_field_name, schedule_variants
+
+# Models whose uploads get resized variants, and the image field on each
+IMAGE_FIELDS = {
+    Course: 'thumbnail',
+    Users: 'profile_picture',
+    Organization: 'logo',
+}
+
+def remember_image_name(sender, instance, **kwargs):
+    # Only when the column was loaded; reading a deferred one would query
+    attname = sender._meta.get_field(IMAGE_FIELDS[sender]).attname
+    if attname in instance.__dict__:
+        instance._image_name = getattr(instance, IMAGE_FIELDS[sender]).name
+
+def reset_image_digest(sender, instance, **kwargs):
+    # A new upload (possibly under the old name) or a different file has no
+    # variants yet, so serializers show the original until generation
+    # records its digest
+    fieldfile = getattr(instance, IMAGE_FIELDS[sender])
+    instance._image_changed = (
+        instance._state.adding
+        or not fieldfile._committed
+        or fieldfile.name != getattr(instance, '_image_name', None)
+    )
+    if not fieldfile or instance._image_changed:
+        setattr(instance, digest_field_name(IMAGE_FIELDS[sender]), '')
+
+def queue_image_variants(sender, instance, update_fields=None, **kwargs):
+    field_name = IMAGE_FIELDS[sender]
+    if update_fields is not None and field_name not in update_fields:
+        return
+    fieldfile = getattr(instance, field_name)
+    instance._image_name = fieldfile.name
+    # Other saves (a login touching last_login, say) leave the image alone
+    if fieldfile and getattr(instance, '_image_changed', False):
+        transaction.on_commit(lambda: schedule_variants(fieldfile))
+
+for model in IMAGE_FIELDS:
+    post_init.connect(remember_image_name, sender=model, dispatch_uid=f'image_name_{model._meta.label}')
+    pre_save.connect(reset_image_digest, sender=model, dispatch_uid=f'image_digest_{model._meta.label}')
+    post_save.connect(queue_image_variants, sender=model, dispatch_uid=f'image_variants_{model._meta.label}')
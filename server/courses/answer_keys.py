@@ -0,0 +1,68 @@
+# courses/answer_keys.py
+from django.core.cache import cache
+from django.db import transaction
+from .models import Quiz, Question, Choice
+
+# Dropped on every Quiz/Question/Choice write (see signals); the timeout
+# only bounds how long a missed invalidation can survive.
+ANSWER_KEY_CACHE_TIMEOUT = 60 * 60 * 24
+
+def answer_key_cache_key(quiz_id):
+    return f'courses:answer-key:{quiz_id}'
+
+def normalize_answer(text):
+    return ' '.join(str(text).split()).casefold()
+
+def build_answer_key(quiz_id):
+    """
+    Everything grading needs for one quiz as plain data, three queries
+    regardless of quiz size. Returns None for an unknown quiz.
+    """
+    quiz = Quiz.objects.filter(pk=quiz_id).values(
+        'id', 'lesson_id', 'lesson__must_complete', 'lesson__module__course_id',
+        'passing_score', 'max_attempts', 'time_limit'
+    ).first()
+    if quiz is None:
+        return None
+
+    questions = {
+        question['id']: {
+            'type': question['question_type'],
+            'points': question['points'],
+            'correct': set(),
+            'accepted': set(),
+        }
+        for question in Question.objects.filter(quiz=quiz_id).values('id', 'question_type', 'points')
+    }
+    correct = Choice.objects.filter(question__quiz=quiz_id, is_correct=True).values_list('id', 'question_id', 'text')
+    for choice_id, question_id, text in correct:
+        questions[question_id]['correct'].add(choice_id)
+        questions[question_id]['accepted'].add(normalize_answer(text))
+
+    return {
+        'quiz_id': quiz['id'],
+        'lesson_id': quiz['lesson_id'],
+        'course_id': quiz['lesson__module__course_id'],
+        'must_complete': quiz['lesson__must_complete'],
+        'passing_score': quiz['passing_score'],
+        'max_attempts': quiz['max_attempts'],
+        'time_limit': quiz['time_limit'],
+        'total_points': sum(question['points'] for question in questions.values()),
+        'questions': questions,
+    }
+
+def get_answer_key(quiz_id):
+    key = answer_key_cache_key(quiz_id)
+    answer_key = cache.get(key)
+    if answer_key is None:
+        answer_key = build_answer_key(quiz_id)
+        if answer_key is not None:
+            cache.set(key, answer_key, ANSWER_KEY_CACHE_TIMEOUT)
+    return answer_key
+
+def invalidate_answer_key(quiz_id):
+    # Delete again after commit so a concurrent reader can't re-cache the
+    # pre-write rows while the transaction is still open
+    key = answer_key_cache_key(quiz_id)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
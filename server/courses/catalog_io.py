@@ -0,0 +1,216 @@
+# courses/catalog_io.py
+"""
+Streaming catalog import/export used by the import_courses and
+export_courses management commands.
+
+JSONL holds one course per line with its full curriculum nested under
+``modules -> lessons -> quiz -> questions -> choices``; the category is
+referenced by name and the instructor by username. CSV holds the same
+course-level columns without curriculum.
+"""
+import csv
+import json
+from itertools import islice
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from user.models import Users
+from .models import CourseCategory, Course, Module, Lesson, Quiz, Question, Choice
+
+COURSE_FIELDS = [
+    'title', 'slug', 'description', 'short_description', 'level', 'status',
+    'video_preview', 'duration_hours', 'language', 'subtitles',
+    'is_cpd_accredited', 'cpd_points', 'accreditation_body',
+    'price', 'is_free', 'discount_price',
+    'prerequisites', 'learning_objectives', 'target_audience', 'published_at',
+]
+MODULE_FIELDS = ['title', 'description', 'order', 'duration_minutes']
+LESSON_FIELDS = [
+    'title', 'lesson_type', 'content', 'video_url', 'video_duration', 'attachments',
+    'order', 'is_preview', 'must_complete', 'completion_threshold',
+]
+QUIZ_FIELDS = ['title', 'description', 'passing_score', 'max_attempts', 'time_limit']
+QUESTION_FIELDS = ['question_type', 'text', 'explanation', 'points', 'order']
+CHOICE_FIELDS = ['text', 'is_correct', 'order']
+
+# Rows per INSERT statement, keeps wide models under the bind-parameter limit
+INSERT_BATCH_SIZE = 1000
+
+CSV_COLUMNS = COURSE_FIELDS + ['category', 'instructor']
+CSV_BOOLEAN_FIELDS = {'is_cpd_accredited', 'is_free'}
+CSV_NULLABLE_FIELDS = {'discount_price', 'published_at'}
+# Blank cells in these columns take the model default
+CSV_DEFAULTED_FIELDS = {'duration_hours', 'cpd_points', 'price'}
+
+def _pick(record, fields):
+    return {field: record[field] for field in fields if field in record}
+
+def _from_csv_row(row):
+    record = {}
+    for field, value in row.items():
+        if field not in CSV_COLUMNS:
+            continue
+        if field in CSV_BOOLEAN_FIELDS:
+            value = value.strip().lower() in ('1', 't', 'true', 'yes')
+        elif field == 'subtitles':
+            value = [code for code in value.split('|') if code]
+        elif field in CSV_NULLABLE_FIELDS and value == '':
+            value = None
+        elif field in CSV_DEFAULTED_FIELDS and value.strip() == '':
+            value = Course._meta.get_field(field).get_default()
+        record[field] = value
+    return record
+
+def read_records(stream, fmt):
+    """Yield course records one at a time from a JSONL or CSV stream"""
+    if fmt == 'csv':
+        for row in csv.DictReader(stream):
+            yield _from_csv_row(row)
+        return
+    for line in stream:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+def _required_lessons(record):
+    """Course.required_lessons for a record; bulk_create skips the signals that keep it"""
+    default = Lesson._meta.get_field('must_complete').default
+    return sum(
+        1
+        for module_record in record.get('modules', [])
+        for lesson_record in module_record.get('lessons', [])
+        if lesson_record.get('must_complete', default)
+    )
+
+def import_chunk(records, default_instructor=None):
+    """
+    Insert one chunk of course records and their curricula in a single
+    transaction: one lookup query per foreign key, then batched bulk INSERTs
+    per model. Returns (rows created, [(course, reason) skipped]).
+    """
+    skipped = []
+
+    # Resolve foreign keys for the whole chunk at once
+    usernames = {record['instructor'] for record in records if record.get('instructor')}
+    instructors = {user.username: user for user in Users.objects.filter(username__in=usernames)}
+    category_names = {record['category'] for record in records if record.get('category')}
+    categories = {category.name: category for category in CourseCategory.objects.filter(name__in=category_names)}
+    existing_slugs = set(
+        Course.objects.filter(slug__in=[record['slug'] for record in records if record.get('slug')]).values_list(
+            'slug', flat=True
+        )
+    )
+
+    with transaction.atomic():
+        missing_categories = [CourseCategory(name=name) for name in category_names - set(categories)]
+        for category in CourseCategory.objects.bulk_create(missing_categories, batch_size=INSERT_BATCH_SIZE):
+            categories[category.name] = category
+
+        courses, pending = [], []
+        for record in records:
+            instructor = instructors.get(record.get('instructor')) or default_instructor
+            if not record.get('slug'):
+                skipped.append((record.get('title') or '(untitled)', 'no slug'))
+                continue
+            if record['slug'] in existing_slugs:
+                skipped.append((record['slug'], 'slug exists'))
+                continue
+            if instructor is None:
+                skipped.append((record['slug'], 'instructor unknown'))
+                continue
+            existing_slugs.add(record['slug'])
+            courses.append(Course(
+                instructor=instructor,
+                category=categories.get(record.get('category')),
+                required_lessons=_required_lessons(record),
+                **_pick(record, COURSE_FIELDS),
+            ))
+            pending.append(record)
+        Course.objects.bulk_create(courses, batch_size=INSERT_BATCH_SIZE)
+
+        # Walk the tree level by level so each level is one bulk INSERT
+        modules, module_records = [], []
+        for course, record in zip(courses, pending):
+            for module_record in record.get('modules', []):
+                modules.append(Module(course=course, **_pick(module_record, MODULE_FIELDS)))
+                module_records.append(module_record)
+        Module.objects.bulk_create(modules, batch_size=INSERT_BATCH_SIZE)
+
+        lessons, lesson_records = [], []
+        for module, module_record in zip(modules, module_records):
+            for lesson_record in module_record.get('lessons', []):
+                lessons.append(Lesson(module=module, **_pick(lesson_record, LESSON_FIELDS)))
+                lesson_records.append(lesson_record)
+        Lesson.objects.bulk_create(lessons, batch_size=INSERT_BATCH_SIZE)
+
+        quizzes, quiz_records = [], []
+        for lesson, lesson_record in zip(lessons, lesson_records):
+            if lesson_record.get('quiz'):
+                quizzes.append(Quiz(lesson=lesson, **_pick(lesson_record['quiz'], QUIZ_FIELDS)))
+                quiz_records.append(lesson_record['quiz'])
+        Quiz.objects.bulk_create(quizzes, batch_size=INSERT_BATCH_SIZE)
+
+        questions, question_records = [], []
+        for quiz, quiz_record in zip(quizzes, quiz_records):
+            for question_record in quiz_record.get('questions', []):
+                questions.append(Question(quiz=quiz, **_pick(question_record, QUESTION_FIELDS)))
+                question_records.append(question_record)
+        Question.objects.bulk_create(questions, batch_size=INSERT_BATCH_SIZE)
+
+        choices = [
+            Choice(question=question, **_pick(choice_record, CHOICE_FIELDS))
+            for question, question_record in zip(questions, question_records)
+            for choice_record in question_record.get('choices', [])
+        ]
+        Choice.objects.bulk_create(choices, batch_size=INSERT_BATCH_SIZE)
+
+    created = len(courses) + len(modules) + len(lessons) + len(quizzes) + len(questions) + len(choices)
+    return created, skipped
+
+def export_record(course, with_curriculum=True):
+    """Course (loaded with its full curriculum prefetched) as an import-compatible record"""
+    record = _pick(course.__dict__, COURSE_FIELDS)
+    record['category'] = course.category.name if course.category else None
+    record['instructor'] = course.instructor.username
+    if not with_curriculum:
+        return record
+
+    record['modules'] = []
+    for module in course.modules.all():
+        module_record = _pick(module.__dict__, MODULE_FIELDS)
+        module_record['lessons'] = []
+        for lesson in module.lessons.all():
+            lesson_record = _pick(lesson.__dict__, LESSON_FIELDS)
+            quiz = getattr(lesson, 'quiz', None)
+            if quiz is not None:
+                lesson_record['quiz'] = _pick(quiz.__dict__, QUIZ_FIELDS)
+                lesson_record['quiz']['questions'] = [
+                    dict(
+                        _pick(question.__dict__, QUESTION_FIELDS),
+                        choices=[_pick(choice.__dict__, CHOICE_FIELDS) for choice in question.choices.all()],
+                    )
+                    for question in quiz.questions.all()
+                ]
+            module_record['lessons'].append(lesson_record)
+        record['modules'].append(module_record)
+    return record
+
+def write_jsonl(stream, record):
+    stream.write(json.dumps(record, cls=DjangoJSONEncoder) + '\n')
+
+def csv_writer(stream):
+    writer = csv.DictWriter(stream, fieldnames=CSV_COLUMNS)
+    writer.writeheader()
+    return writer
+
+def write_csv(writer, record):
+    row = dict(record)
+    row['subtitles'] = '|'.join(row.get('subtitles') or [])
+    writer.writerow({column: '' if row.get(column) is None else row[column] for column in CSV_COLUMNS})
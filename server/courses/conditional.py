@@ -0,0 +1,49 @@
+# courses/conditional.py
+import hashlib
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+def build_validators(parts):
+    """
+    Strong ETag and Last-Modified timestamp from a dict of aggregate values.
+
+    ``parts`` holds max ``updated_at`` timestamps plus row counts, so edits
+    move a timestamp and deletions move a count.
+    """
+    digest = hashlib.sha1(repr(sorted(parts.items())).encode()).hexdigest()
+    timestamps = [value for value in parts.values() if hasattr(value, 'timestamp')]
+    last_modified = int(max(timestamps).timestamp()) if timestamps else None
+    return f'"{digest}"', last_modified
+
+class ConditionalGetMixin:
+    """
+    Answers If-None-Match / If-Modified-Since for list and retrieve from
+    get_validators() alone, before any object is loaded or serialized.
+    """
+
+    def get_validators(self):
+        """Return a dict of aggregate values for the requested resource, or None to skip"""
+        return None
+
+    def list(self, request, *args, **kwargs):
+        return self._conditional(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._conditional(super().retrieve, request, *args, **kwargs)
+
+    def _conditional(self, view, request, *args, **kwargs):
+        parts = self.get_validators()
+        if not parts:
+            return view(request, *args, **kwargs)
+
+        etag, last_modified = build_validators(parts)
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        response = view(request, *args, **kwargs)
+        if response.status_code == 200:
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+        return response
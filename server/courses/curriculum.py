@@ -0,0 +1,87 @@
+# courses/curriculum.py
+from django.core.cache import cache
+from django.db.models import F
+from .models import Module, Lesson
+
+# Keys carry the content version, so stale outlines are never read and
+# simply age out; no explicit invalidation is needed.
+CURRICULUM_CACHE_TIMEOUT = 60 * 60 * 24
+
+def curriculum_cache_key(course_id, version):
+    return f'courses:curriculum:{course_id}:v{version}'
+
+def bump_content_version(courses):
+    """Invalidate cached outlines for a Course queryset"""
+    courses.update(content_version=F('content_version') + 1)
+
+def build_curriculum(course_id, version):
+    """Module/lesson outline as plain data, two queries regardless of course size"""
+    modules = list(
+        Module.objects.filter(course=course_id).order_by('order', 'id').values(
+            'id', 'title', 'order', 'duration_minutes'
+        )
+    )
+    lessons_by_module = {module['id']: [] for module in modules}
+    lessons = Lesson.objects.filter(module__course=course_id).order_by('order', 'id').values(
+        'id', 'module_id', 'title', 'lesson_type', 'video_duration',
+        'order', 'is_preview', 'must_complete', 'quiz__id'
+    )
+    for lesson in lessons:
+        module_id = lesson.pop('module_id')
+        lesson['quiz_id'] = lesson.pop('quiz__id')
+        lessons_by_module[module_id].append(lesson)
+    
+    for module in modules:
+        module['lessons'] = lessons_by_module[module['id']]
+    
+    return {'course_id': course_id, 'version': version, 'modules': modules}
+
+def get_curriculum(course_id, version):
+    key = curriculum_cache_key(course_id, version)
+    curriculum = cache.get(key)
+    if curriculum is None:
+        curriculum = build_curriculum(course_id, version)
+        cache.set(key, curriculum, CURRICULUM_CACHE_TIMEOUT)
+    return curriculum
+
+def lesson_sequence_cache_key(course_id, version):
+    return f'courses:lesson-sequence:{course_id}:v{version}'
+
+def build_lesson_sequence(course_id, version):
+    """The course's lessons flattened into learning order, with each lesson's index"""
+    lessons = [
+        {
+            'id': lesson['id'],
+            'title': lesson['title'],
+            'lesson_type': lesson['lesson_type'],
+            'module_id': module['id'],
+            'module_title': module['title'],
+        }
+        for module in get_curriculum(course_id, version)['modules']
+        for lesson in module['lessons']
+    ]
+    return {
+        'lessons': lessons,
+        'ids': [lesson['id'] for lesson in lessons],
+        'positions': {lesson['id']: index for index, lesson in enumerate(lessons)},
+    }
+
+def get_lesson_sequences(versions):
+    """{course_id: sequence} for {course_id: content_version}, one cache round trip when warm"""
+    keys = {lesson_sequence_cache_key(course_id, version): course_id for course_id, version in versions.items()}
+    cached = cache.get_many(keys)
+    sequences = {keys[key]: sequence for key, sequence in cached.items()}
+    for key, course_id in keys.items():
+        if key not in cached:
+            sequences[course_id] = build_lesson_sequence(course_id, versions[course_id])
+            cache.set(key, sequences[course_id], CURRICULUM_CACHE_TIMEOUT)
+    return sequences
+
+def get_lesson_sequence(course_id, version):
+    return get_lesson_sequences({course_id: version})[course_id]
+
+def resume_point(sequence, furthest_lesson_id):
+    """(position, lesson) following the furthest completed lesson; lesson is None once past the end"""
+    position = sequence['positions'].get(furthest_lesson_id, -1) + 1
+    lessons = sequence['lessons']
+    return position, lessons[position] if position < len(lessons) else None
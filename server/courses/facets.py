@@ -0,0 +1,73 @@
+# courses/facets.py
+from django.db import connection
+from django.db.models import F
+from .models import Course
+
+# (facet name, subquery column) in GROUPING() argument order
+FACET_COLUMNS = [
+    ('category', 'facet_category'),
+    ('level', 'facet_level'),
+    ('is_free', 'facet_is_free'),
+    ('is_cpd_accredited', 'facet_is_cpd_accredited'),
+    ('language', 'facet_language'),
+]
+
+LEVEL_LABELS = dict(Course.LEVEL_CHOICES)
+
+def _grouping_masks():
+    # GROUPING(a, b, ...) sets the bit of every argument *not* grouped on,
+    # first argument most significant
+    full = (1 << len(FACET_COLUMNS)) - 1
+    masks = {full: 'total'}
+    for position, (name, _) in enumerate(FACET_COLUMNS):
+        masks[full ^ (1 << (len(FACET_COLUMNS) - 1 - position))] = name
+    return masks
+
+GROUPING_MASKS = _grouping_masks()
+
+def compute_facets(queryset):
+    """
+    Counts per category, level, is_free, is_cpd_accredited and language for
+    an already-filtered Course queryset, in a single GROUPING SETS query.
+    """
+    filtered = queryset.order_by().values(
+        facet_category=F('category_id'),
+        facet_category_name=F('category__name'),
+        facet_level=F('level'),
+        facet_is_free=F('is_free'),
+        facet_is_cpd_accredited=F('is_cpd_accredited'),
+        facet_language=F('language'),
+    )
+    inner_sql, params = filtered.query.sql_with_params()
+    columns = ', '.join(column for _, column in FACET_COLUMNS)
+    grouping_sets = ', '.join(
+        '(facet_category, facet_category_name)' if name == 'category' else f'({column})'
+        for name, column in FACET_COLUMNS
+    )
+    sql = (
+        f'SELECT GROUPING({columns}), {columns}, facet_category_name, COUNT(*) '
+        f'FROM ({inner_sql}) AS filtered '
+        f'GROUP BY GROUPING SETS ({grouping_sets}, ())'
+    )
+    
+    facets = {name: [] for name, _ in FACET_COLUMNS}
+    total = 0
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        for grouping, *values, category_name, count in cursor.fetchall():
+            facet = GROUPING_MASKS.get(grouping)
+            if facet == 'total':
+                total = count
+                continue
+            value = values[[name for name, _ in FACET_COLUMNS].index(facet)]
+            item = {'value': value, 'count': count}
+            if facet == 'category':
+                item['label'] = category_name
+            elif facet == 'level':
+                item['label'] = LEVEL_LABELS.get(value, value)
+            facets[facet].append(item)
+    
+    for values in facets.values():
+        values.sort(key=lambda item: -item['count'])
+    
+    return {'total': total, 'facets': facets}
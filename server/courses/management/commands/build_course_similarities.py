@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from courses.recommendations import rebuild_similarities
+
+class Command(BaseCommand):
+    help = 'Fold new enrollments into the course co-enrollment neighbour lists (run on a schedule)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='Rebuild every course instead of only those touched by new enrollments (run periodically to correct drift)')
+    
+    def handle(self, *args, **options):
+        written = rebuild_similarities(full=options['full'])
+        self.stdout.write(self.style.SUCCESS(f'Wrote {written} course similarity rows'))
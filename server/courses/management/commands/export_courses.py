@@ -0,0 +1,42 @@
+import sys
+from django.core.management.base import BaseCommand
+from courses.catalog_io import csv_writer, export_record, write_csv, write_jsonl
+from courses.models import Course
+
+class Command(BaseCommand):
+    help = 'Stream courses with their curricula to JSONL (or course rows to CSV) without loading the catalog'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Output file, or '-' for stdout")
+        parser.add_argument('--format', choices=['jsonl', 'csv'], help='Defaults to the file extension, else jsonl')
+        parser.add_argument('--batch-size', type=int, default=200, help='Courses fetched per round trip')
+        parser.add_argument('--status', choices=[choice for choice, _ in Course.STATUS_CHOICES])
+    
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or ('csv' if path.endswith('.csv') else 'jsonl')
+        
+        if fmt == 'csv':
+            courses = Course.objects.for_list()
+        else:
+            # Records carry answer keys, so load questions and choices directly
+            courses = Course.objects.for_detail().prefetch_related('modules__lessons__quiz__questions__choices')
+        if options['status']:
+            courses = courses.filter(status=options['status'])
+        
+        stream = sys.stdout if path == '-' else open(path, 'w', newline='', encoding='utf-8')
+        exported = 0
+        try:
+            writer = csv_writer(stream) if fmt == 'csv' else None
+            # iterator() with chunk_size keeps prefetching per chunk
+            for course in courses.order_by('id').iterator(chunk_size=options['batch_size']):
+                if writer:
+                    write_csv(writer, export_record(course, with_curriculum=False))
+                else:
+                    write_jsonl(stream, export_record(course))
+                exported += 1
+        finally:
+            if stream is not sys.stdout:
+                stream.close()
+        
+        self.stderr.write(self.style.SUCCESS(f'Exported {exported} courses'))
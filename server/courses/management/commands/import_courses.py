@@ -0,0 +1,45 @@
+import sys
+import time
+from django.core.management.base import BaseCommand, CommandError
+from courses.catalog_io import chunked, import_chunk, read_records
+from courses.rankings import refresh_rankings
+from user.models import Users
+
+class Command(BaseCommand):
+    help = 'Stream courses with their curricula from a JSONL or CSV file using chunked bulk inserts'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Input file, or '-' for stdin")
+        parser.add_argument('--format', choices=['jsonl', 'csv'], help='Defaults to the file extension, else jsonl')
+        parser.add_argument('--batch-size', type=int, default=500, help='Courses per transaction')
+        parser.add_argument('--instructor', help='Username used for records without a known instructor')
+    
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or ('csv' if path.endswith('.csv') else 'jsonl')
+        
+        default_instructor = None
+        if options['instructor']:
+            default_instructor = Users.objects.filter(username=options['instructor']).first()
+            if default_instructor is None:
+                raise CommandError(f"Unknown instructor '{options['instructor']}'")
+        
+        stream = sys.stdin if path == '-' else open(path, newline='', encoding='utf-8')
+        created = skipped = 0
+        started = time.monotonic()
+        try:
+            for chunk in chunked(read_records(stream, fmt), options['batch_size']):
+                chunk_created, chunk_skipped = import_chunk(chunk, default_instructor)
+                created += chunk_created
+                skipped += len(chunk_skipped)
+                for course, reason in chunk_skipped:
+                    self.stderr.write(f'Skipped {course}: {reason}')
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+        
+        refresh_rankings()
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {created} rows in {elapsed:.1f}s ({created / max(elapsed, 1e-6):.0f} rows/s), skipped {skipped} courses'
+        ))
@@ -0,0 +1,9 @@
+from django.core.management.base import BaseCommand
+from courses.rankings import RANKINGS, refresh_rankings
+
+class Command(BaseCommand):
+    help = 'Rebuild the cached featured/popular course payloads (run on a schedule)'
+    
+    def handle(self, *args, **options):
+        refresh_rankings()
+        self.stdout.write(self.style.SUCCESS(f"Refreshed rankings: {', '.join(RANKINGS)}"))
@@ -0,0 +1,70 @@
+# Generated by Django 5.2.9 on 2026-10-18 02:12
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations
+
+COURSE_SEARCH_VECTOR_SQL = """
+CREATE OR REPLACE FUNCTION courses_course_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(
+            (SELECT name FROM courses_coursecategory WHERE id = NEW.category_id), ''
+        )), 'B') ||
+        setweight(to_tsvector('english', coalesce(NEW.short_description, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(NEW.description, '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER courses_course_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, short_description, description, category_id
+    ON courses_course
+    FOR EACH ROW EXECUTE FUNCTION courses_course_search_vector_update();
+
+-- Renaming a category re-fires the course trigger for its courses
+CREATE OR REPLACE FUNCTION courses_category_search_vector_refresh() RETURNS trigger AS $$
+BEGIN
+    UPDATE courses_course SET title = title WHERE category_id = NEW.id;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER courses_category_search_vector_trigger
+    AFTER UPDATE OF name ON courses_coursecategory
+    FOR EACH ROW WHEN (OLD.name IS DISTINCT FROM NEW.name)
+    EXECUTE FUNCTION courses_category_search_vector_refresh();
+
+-- Backfill existing rows
+UPDATE courses_course SET title = title;
+"""
+
+DROP_COURSE_SEARCH_VECTOR_SQL = """
+DROP TRIGGER IF EXISTS courses_category_search_vector_trigger ON courses_coursecategory;
+DROP FUNCTION IF EXISTS courses_category_search_vector_refresh();
+DROP TRIGGER IF EXISTS courses_course_search_vector_trigger ON courses_course;
+DROP FUNCTION IF EXISTS courses_course_search_vector_update();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='course',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='courses_cou_search__e2a3ab_gin'),
+        ),
+        migrations.RunSQL(COURSE_SEARCH_VECTOR_SQL, DROP_COURSE_SEARCH_VECTOR_SQL),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.9 on 2026-10-18 02:13
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.conf import settings
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0002_course_search_vector'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='course',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['title'], name='course_title_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='coursecategory',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['name'], name='coursecategory_name_trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.9 on 2026-10-18 02:29
+
+from django.db import migrations, models
+
+BACKFILL_REQUIRED_LESSONS_SQL = """
+UPDATE courses_course c SET required_lessons = (
+    SELECT COUNT(*) FROM courses_lesson l
+    JOIN courses_module m ON m.id = l.module_id
+    WHERE m.course_id = c.id AND l.must_complete
+);
+"""
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0007_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='required_lessons',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunSQL(BACKFILL_REQUIRED_LESSONS_SQL, migrations.RunSQL.noop),
+    ]
@@ -1,5 +1,7 @@
 from django.db import models
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVectorField
 from user.models import Users
 
 class CourseCategory(models.Model):
@@ -12,10 +14,35 @@ class CourseCategory(models.Model):
     
     class Meta:
         verbose_name_plural = 'Course Categories'
+        indexes = [
+            GinIndex(fields=['name'], name='coursecategory_name_trgm', opclasses=['gin_trgm_ops']),
+        ]
     
     def __str__(self):
         return self.name
 
+class CourseQuerySet(models.QuerySet):
+    def published(self):
+        return self.filter(status='published')
+    
+    def search(self, text):
+        """Ranked full-text match against the trigger-maintained search_vector"""
+        query = SearchQuery(text, search_type='websearch', config='english')
+        return self.filter(search_vector=query).annotate(
+            rank=SearchRank(models.F('search_vector'), query)
+        ).order_by('-rank', '-total_enrollments', '-id')
+    
+    def for_list(self):
+        """Catalog cards: course row plus instructor and category in one joined query"""
+        return self.select_related('instructor', 'category').defer('search_vector')
+    
+    def for_detail(self):
+        """Full curriculum: one query per tree level, independent of course size"""
+        # Quiz questions and choices come from the cached quiz payload
+        return self.select_related('instructor', 'category').defer('search_vector').prefetch_related(
+            'modules__lessons__quiz'
+        )
+
 class Course(models.Model):
     LEVEL_CHOICES = [
         ('beginner', 'Beginner'),
@@ -42,6 +69,7 @@ class Course(models.Model):
     
     # Course details
     thumbnail = models.ImageField(upload_to='course_thumbnails/', blank=True, null=True)
+    thumbnail_digest = models.CharField(max_length=16, blank=True, editable=False)  # see core.images
     video_preview = models.URLField(blank=True)
     duration_hours = models.IntegerField(default=0)  # Total hours
     language = models.CharField(max_length=50, default='English')
@@ -72,11 +100,26 @@ class Course(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     published_at = models.DateTimeField(null=True, blank=True)
     
+    # Weighted tsvector over title (A), category name and short_description (B)
+    # and description (C). Maintained by a database trigger, see migration 0002.
+    search_vector = SearchVectorField(null=True, editable=False)
+    
+    # Bumped whenever a module, lesson or quiz of the course changes
+    content_version = models.PositiveIntegerField(default=1, editable=False)
+    
+    # must_complete lessons; kept in sync by enrollments.progress
+    required_lessons = models.PositiveIntegerField(default=0, editable=False)
+    
+    objects = CourseQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['slug', 'status']),
             models.Index(fields=['category', 'level']),
+            models.Index(fields=['status', '-created_at']),
+            GinIndex(fields=['search_vector']),
+            GinIndex(fields=['title'], name='course_title_trgm', opclasses=['gin_trgm_ops']),
         ]
     
     def __str__(self):
@@ -96,6 +139,7 @@ class Module(models.Model):
     description = models.TextField(blank=True)
     order = models.PositiveIntegerField(default=0)
     duration_minutes = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         ordering = ['order']
@@ -127,6 +171,8 @@ class Lesson(models.Model):
     must_complete = models.BooleanField(default=True)
     completion_threshold = models.IntegerField(default=80)  # For quizzes
     
+    updated_at = models.DateTimeField(auto_now=True)  # also bumped by quiz edits, see signals
+    
     class Meta:
         ordering = ['order']
     
@@ -174,4 +220,18 @@ class Choice(models.Model):
         ordering = ['order']
     
     def __str__(self):
-        return f"{self.text} ({'✓' if self.is_correct else '✗'})"
\ No newline at end of file
+        return f"{self.text} ({'✓' if self.is_correct else '✗'})"
+
+class CourseSimilarity(models.Model):
+    """Top-K co-enrollment neighbours of a course, rebuilt offline by build_course_similarities"""
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='similarities')
+    similar_course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='+')
+    score = models.FloatField()  # cosine similarity of enrollment vectors
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        unique_together = ['course', 'similar_course']
+        verbose_name_plural = 'Course Similarities'
+    
+    def __str__(self):
+        return f"{self.course_id} ~ {self.similar_course_id} ({self.score:.3f})"
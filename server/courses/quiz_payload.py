@@ -0,0 +1,90 @@
+# courses/quiz_payload.py
+"""
+Learner-facing quiz payloads.
+
+The payload carries no answer key: no ``is_correct``, no explanations and no
+choices for short-answer questions (those choices are the accepted answers).
+It is built once per quiz content version, dropped by the same signals that
+drop answer keys, and served from cache. Per-attempt shuffling reorders a
+copy of the cached lists and never touches the database.
+"""
+import random
+from django.core.cache import cache
+from django.db import transaction
+from .models import Quiz, Question, Choice
+
+QUIZ_PAYLOAD_CACHE_TIMEOUT = 60 * 60 * 24
+
+def quiz_payload_cache_key(quiz_id):
+    return f'courses:quiz-payload:{quiz_id}'
+
+def build_quiz_payloads(quiz_ids):
+    """{quiz id: payload} with questions and choices, three queries however many quizzes"""
+    quizzes = {
+        quiz['id']: quiz
+        for quiz in Quiz.objects.filter(pk__in=list(quiz_ids)).values(
+            'id', 'title', 'description', 'passing_score', 'max_attempts', 'time_limit'
+        )
+    }
+    for quiz in quizzes.values():
+        quiz['questions'] = []
+    if not quizzes:
+        return quizzes
+
+    choices_by_question = {}
+    questions = Question.objects.filter(quiz__in=list(quizzes)).order_by('order', 'id').values(
+        'id', 'quiz_id', 'question_type', 'text', 'points', 'order'
+    )
+    for question in questions:
+        question['choices'] = []
+        quizzes[question.pop('quiz_id')]['questions'].append(question)
+        if question['question_type'] != 'short_answer':
+            choices_by_question[question['id']] = question['choices']
+
+    choices = Choice.objects.filter(question__in=list(choices_by_question)).order_by('order', 'id').values(
+        'id', 'question_id', 'text', 'order'
+    )
+    for choice in choices:
+        choices_by_question[choice.pop('question_id')].append(choice)
+    return quizzes
+
+def get_quiz_payloads(quiz_ids):
+    """{quiz id: payload} in one cache round trip; misses are built together and cached"""
+    keys = {quiz_payload_cache_key(quiz_id): quiz_id for quiz_id in set(quiz_ids)}
+    cached = cache.get_many(list(keys))
+    payloads = {keys[key]: payload for key, payload in cached.items()}
+    missing = [quiz_id for quiz_id in keys.values() if quiz_id not in payloads]
+    if missing:
+        built = build_quiz_payloads(missing)
+        cache.set_many(
+            {quiz_payload_cache_key(quiz_id): payload for quiz_id, payload in built.items()},
+            QUIZ_PAYLOAD_CACHE_TIMEOUT,
+        )
+        payloads.update(built)
+    return payloads
+
+def get_quiz_payload(quiz_id):
+    return get_quiz_payloads([quiz_id]).get(quiz_id)
+
+def hide_timed_questions(payload):
+    """Timed quizzes reveal their questions only when an attempt is started"""
+    if not payload or not payload['time_limit']:
+        return payload
+    summary = {key: value for key, value in payload.items() if key != 'questions'}
+    summary['question_count'] = len(payload['questions'])
+    return summary
+
+def invalidate_quiz_payload(quiz_id):
+    key = quiz_payload_cache_key(quiz_id)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
+
+def shuffle_quiz_payload(payload, seed):
+    """Copy of ``payload`` with question and choice order shuffled deterministically by ``seed``"""
+    rng = random.Random(seed)
+    questions = [
+        dict(question, choices=rng.sample(question['choices'], len(question['choices'])))
+        for question in payload['questions']
+    ]
+    rng.shuffle(questions)
+    return dict(payload, questions=questions)
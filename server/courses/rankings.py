@@ -0,0 +1,53 @@
+# courses/rankings.py
+from django.core.cache import cache
+from .models import Course
+from .serializers import CourseListSerializer
+
+RANKING_SIZE = 8
+
+# Long enough that the homepage never touches the database between
+# refreshes, short enough that a missed invalidation heals itself.
+RANKING_CACHE_TIMEOUT = 60 * 60
+
+RANKINGS = {
+    'featured': ['-average_rating', '-total_enrollments'],
+    'popular': ['-total_enrollments'],
+}
+
+def ranking_cache_key(name):
+    return f'courses:rankings:{name}'
+
+def build_ranking(name):
+    """Serialize a ranked course list and store it as a ready-to-serve payload"""
+    courses = Course.objects.published().for_list().order_by(*RANKINGS[name], '-id')[:RANKING_SIZE]
+    payload = CourseListSerializer(courses, many=True).data
+    cache.set(ranking_cache_key(name), payload, RANKING_CACHE_TIMEOUT)
+    return payload
+
+def absolute_urls(payload, request):
+    """
+    Payloads are built without a request, so media URLs are stored as the
+    storage returns them; expand them per request like the live serializers
+    """
+    courses = []
+    for course in payload:
+        course = dict(course)
+        if course['thumbnail']:
+            course['thumbnail'] = request.build_absolute_uri(course['thumbnail'])
+        if course['thumbnail_variants']:
+            course['thumbnail_variants'] = {
+                extension: {width: request.build_absolute_uri(url) for width, url in urls.items()}
+                for extension, urls in course['thumbnail_variants'].items()
+            }
+        courses.append(course)
+    return courses
+
+def get_ranking(name, request):
+    payload = cache.get(ranking_cache_key(name))
+    if payload is None:
+        payload = build_ranking(name)
+    return absolute_urls(payload, request)
+
+def refresh_rankings():
+    for name in RANKINGS:
+        build_ranking(name)
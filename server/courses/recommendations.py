@@ -0,0 +1,138 @@
+# courses/recommendations.py
+import numpy as np
+from scipy import sparse
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Max
+from enrollments.models import Enrollment
+from .models import Course, CourseSimilarity
+
+# Highest Enrollment id already folded into CourseSimilarity. It lives in
+# the cache, so an eviction just turns the next run into a full rebuild.
+WATERMARK_CACHE_KEY = 'courses:recommendations:watermark'
+
+WRITE_BATCH_SIZE = 5000
+
+def _enrollment_pairs(queryset):
+    """(user index, course index) arrays plus the course ids backing the columns"""
+    rows = np.fromiter(
+        (value for pair in queryset.values_list('user_id', 'course_id').iterator(chunk_size=WRITE_BATCH_SIZE) for value in pair),
+        dtype=np.int64,
+    ).reshape(-1, 2)
+    _, user_index = np.unique(rows[:, 0], return_inverse=True)
+    course_ids, course_index = np.unique(rows[:, 1], return_inverse=True)
+    return user_index, course_index, course_ids
+
+def build_similarities(course_ids=None, top_k=None):
+    """
+    Recompute the top-K neighbour lists for ``course_ids`` (all courses when None).
+
+    Only users enrolled in the target courses are loaded; column norms come
+    from one grouped COUNT over all enrollments, so the rows written are
+    exact cosine scores as of now. Rows of courses outside ``course_ids``
+    are left as they were.
+    """
+    top_k = top_k or settings.COURSE_RECOMMENDATION_NEIGHBOURS
+    enrollments = Enrollment.objects.exclude(status='dropped')
+
+    if course_ids is None:
+        sample = enrollments
+    else:
+        course_ids = list(course_ids)
+        sample = enrollments.filter(
+            user__in=enrollments.filter(course__in=course_ids).values('user')
+        )
+
+    user_index, course_index, column_ids = _enrollment_pairs(sample)
+    neighbours = []
+
+    if len(column_ids):
+        # Binary user x course matrix; X.T @ X gives co-enrollment counts
+        matrix = sparse.csr_matrix(
+            (np.ones(len(user_index), dtype=np.float32), (user_index, course_index)),
+            shape=(user_index.max() + 1, len(column_ids)),
+        )
+        if course_ids is None:
+            target_columns = np.arange(len(column_ids))
+        else:
+            target_columns = np.flatnonzero(np.isin(column_ids, course_ids))
+        co_counts = (matrix[:, target_columns].T @ matrix).tocsr()
+
+        totals = dict(
+            enrollments.filter(course__in=column_ids.tolist())
+            .values('course').annotate(n=Count('id')).values_list('course', 'n')
+        )
+        norms = np.sqrt(np.array([totals.get(course_id, 0) for course_id in column_ids.tolist()], dtype=np.float32))
+        norms[norms == 0] = 1.0
+
+        for row, column in enumerate(target_columns):
+            start, end = co_counts.indptr[row], co_counts.indptr[row + 1]
+            columns = co_counts.indices[start:end]
+            scores = co_counts.data[start:end] / (norms[column] * norms[columns])
+
+            keep = columns != column
+            columns, scores = columns[keep], scores[keep]
+            if len(columns) > top_k:
+                best = np.argpartition(-scores, top_k)[:top_k]
+                columns, scores = columns[best], scores[best]
+
+            course_id = int(column_ids[column])
+            neighbours.extend(
+                CourseSimilarity(course_id=course_id, similar_course_id=int(column_ids[c]), score=float(score))
+                for c, score in zip(columns, scores)
+            )
+
+    with transaction.atomic():
+        if course_ids is None:
+            CourseSimilarity.objects.all().delete()
+        else:
+            CourseSimilarity.objects.filter(course__in=course_ids).delete()
+        CourseSimilarity.objects.bulk_create(neighbours, batch_size=WRITE_BATCH_SIZE)
+
+    return len(neighbours)
+
+def rebuild_similarities(full=False):
+    """
+    Fold enrollments created since the last run, or rebuild everything.
+
+    Incremental runs only rewrite the courses new enrollments touched, so
+    other courses keep scores computed against older norms, and drops are
+    not picked up at all. Both drift until the next ``full`` rebuild, which
+    should run periodically.
+    """
+    watermark = None if full else cache.get(WATERMARK_CACHE_KEY)
+    latest = Enrollment.objects.aggregate(latest=Max('id'))['latest'] or 0
+
+    if watermark is None:
+        written = build_similarities()
+    else:
+        # A new enrollment changes the rows of its course and of every
+        # other course its user is enrolled in
+        new_users = Enrollment.objects.filter(id__gt=watermark, id__lte=latest).values('user')
+        affected = set(Enrollment.objects.filter(user__in=new_users).values_list('course_id', flat=True))
+        written = build_similarities(affected) if affected else 0
+
+    cache.set(WATERMARK_CACHE_KEY, latest, None)
+    return written
+
+def recommend_for_user(user, limit=8):
+    """
+    Merge the stored neighbour lists of the user's courses.
+
+    Reads len(enrolled) * K similarity rows through the (course, similar_course)
+    index, independent of catalog size.
+    """
+    enrolled = set(Enrollment.objects.filter(user=user).values_list('course_id', flat=True))
+    if not enrolled:
+        return []
+
+    scores = {}
+    for course_id, score in CourseSimilarity.objects.filter(course__in=enrolled).values_list('similar_course_id', 'score'):
+        if course_id not in enrolled:
+            scores[course_id] = scores.get(course_id, 0.0) + score
+
+    # Over-fetch so unpublished neighbours don't leave the list short
+    candidates = sorted(scores, key=scores.get, reverse=True)[:limit * 2]
+    courses = Course.objects.published().for_list().in_bulk(candidates)
+    return [courses[course_id] for course_id in candidates if course_id in courses][:limit]
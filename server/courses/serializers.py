@@ -1,22 +1,31 @@
 from rest_framework import serializers
 from .models import CourseCategory, Course, Module, Lesson, Quiz, Question, Choice
+from core.fields import ImageVariantsField
+from .quiz_payload import get_quiz_payloads, hide_timed_questions
+from user.models import Users
 from user.serializers import UserSerializer
 
 class CourseCategorySerializer(serializers.ModelSerializer):
+    # Annotated by CourseCategoryViewSet; omitted where the queryset lacks it
     course_count = serializers.IntegerField(read_only=True)
     
     class Meta:
         model = CourseCategory
         fields = ['id', 'name', 'description', 'icon', 'color', 'course_count', 'created_at', 'updated_at']
-    
-    def get_course_count(self, obj):
-        return obj.courses.count()
 
 class ChoiceSerializer(serializers.ModelSerializer):
     class Meta:
         model = Choice
         fields = ['id', 'text', 'is_correct', 'order']
 
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # Answers are graded server-side; only staff editing quizzes see them
+        request = self.context.get('request')
+        if request is None or not request.user.is_staff:
+            data.pop('is_correct', None)
+        return data
+
 class QuestionSerializer(serializers.ModelSerializer):
     choices = ChoiceSerializer(many=True, read_only=True)
     
@@ -24,6 +33,17 @@ class QuestionSerializer(serializers.ModelSerializer):
         model = Question
         fields = ['id', 'question_type', 'text', 'explanation', 'points', 'order', 'choices']
 
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        request = self.context.get('request')
+        if request is None or not request.user.is_staff:
+            # Explanations give the answer away, and a short-answer
+            # question's choices are its accepted answers
+            data.pop('explanation', None)
+            if instance.question_type == 'short_answer':
+                data['choices'] = []
+        return data
+
 class QuizSerializer(serializers.ModelSerializer):
     questions = QuestionSerializer(many=True, read_only=True)
     
@@ -31,35 +51,99 @@ class QuizSerializer(serializers.ModelSerializer):
         model = Quiz
         fields = ['id', 'title', 'description', 'passing_score', 'max_attempts', 'time_limit', 'questions']
 
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        request = self.context.get('request')
+        if request is None or not request.user.is_staff:
+            data = hide_timed_questions(data)
+        return data
+
+def _lesson_quiz_id(lesson):
+    try:
+        return lesson.quiz.id
+    except Quiz.DoesNotExist:
+        return None
+
+def _prefetched(instance, name):
+    """The prefetched rows of a relation, or None when it would need a query"""
+    return getattr(instance, '_prefetched_objects_cache', {}).get(name)
+
+def prime_quiz_payloads(context, lessons):
+    """
+    Load the quiz payloads of ``lessons`` into the serializer context in one
+    cache round trip (misses are built together), so nested LessonSerializers
+    don't fetch them one by one
+    """
+    payloads = context.setdefault('quiz_payloads', {})
+    quiz_ids = {_lesson_quiz_id(lesson) for lesson in lessons} - {None} - payloads.keys()
+    if quiz_ids:
+        payloads.update(get_quiz_payloads(quiz_ids))
+    return payloads
+
+def prime_module_quiz_payloads(context, modules):
+    """prime_quiz_payloads() over every module whose lessons are prefetched"""
+    lessons = []
+    for module in modules:
+        lessons.extend(_prefetched(module, 'lessons') or [])
+    prime_quiz_payloads(context, lessons)
+
+class LessonListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        lessons = list(data.all() if hasattr(data, 'all') else data)
+        prime_quiz_payloads(self.context, lessons)
+        return super().to_representation(lessons)
+
 class LessonSerializer(serializers.ModelSerializer):
-    quiz = QuizSerializer(read_only=True)
+    quiz = serializers.SerializerMethodField()
     
     class Meta:
         model = Lesson
+        list_serializer_class = LessonListSerializer
         fields = [
             'id', 'module', 'title', 'lesson_type', 'content', 
             'video_url', 'video_duration', 'attachments', 'order',
             'is_preview', 'must_complete', 'completion_threshold', 'quiz'
         ]
+    
+    def get_quiz(self, obj):
+        # Cached learner-safe payload, usually primed by the enclosing list or
+        # course; pair with select/prefetch of 'quiz' only
+        quiz_id = _lesson_quiz_id(obj)
+        if quiz_id is None:
+            return None
+        payload = prime_quiz_payloads(self.context, [obj]).get(quiz_id)
+        request = self.context.get('request')
+        if request is None or not request.user.is_staff:
+            payload = hide_timed_questions(payload)
+        return payload
+
+class ModuleListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        modules = list(data.all() if hasattr(data, 'all') else data)
+        prime_module_quiz_payloads(self.context, modules)
+        return super().to_representation(modules)
 
 class ModuleSerializer(serializers.ModelSerializer):
     lessons = LessonSerializer(many=True, read_only=True)
     
     class Meta:
         model = Module
+        list_serializer_class = ModuleListSerializer
         fields = ['id', 'course', 'title', 'description', 'order', 'duration_minutes', 'lessons']
 
 class CourseSerializer(serializers.ModelSerializer):
+    """Full curriculum representation; pair with Course.objects.for_detail()"""
     instructor = UserSerializer(read_only=True)
     category = CourseCategorySerializer(read_only=True)
     modules = ModuleSerializer(many=True, read_only=True)
+    thumbnail_variants = ImageVariantsField('thumbnail')
     
     class Meta:
         model = Course
         fields = [
             'id', 'title', 'slug', 'description', 'short_description',
             'instructor', 'category', 'level', 'status',
-            'thumbnail', 'video_preview', 'duration_hours', 'language', 'subtitles',
+            'thumbnail', 'thumbnail_variants', 'video_preview', 'duration_hours', 'language', 'subtitles',
             'is_cpd_accredited', 'cpd_points', 'accreditation_body',
             'price', 'is_free', 'discount_price',
             'prerequisites', 'learning_objectives', 'target_audience',
@@ -68,6 +152,44 @@ class CourseSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['total_enrollments', 'average_rating', 'total_reviews', 'created_at', 'updated_at']
 
+class CourseInstructorSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Users
+        fields = ['id', 'username', 'first_name', 'last_name']
+
+class CourseCategorySummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = CourseCategory
+        fields = ['id', 'name', 'icon', 'color']
+
+class CourseListSerializer(serializers.ModelSerializer):
+    """Catalog card representation; pair with Course.objects.for_list()"""
+    instructor = CourseInstructorSerializer(read_only=True)
+    category = CourseCategorySummarySerializer(read_only=True)
+    thumbnail_variants = ImageVariantsField('thumbnail')
+    
+    class Meta:
+        model = Course
+        fields = [
+            'id', 'title', 'slug', 'short_description',
+            'instructor', 'category', 'level',
+            'thumbnail', 'thumbnail_variants', 'duration_hours', 'language',
+            'is_cpd_accredited', 'cpd_points',
+            'price', 'is_free', 'discount_price',
+            'total_enrollments', 'average_rating', 'total_reviews',
+            'published_at'
+        ]
+        read_only_fields = fields
+
+class CourseSummarySerializer(serializers.ModelSerializer):
+    """Just enough to link to a course from another resource"""
+    thumbnail_variants = ImageVariantsField('thumbnail')
+    
+    class Meta:
+        model = Course
+        fields = ['id', 'title', 'slug', 'thumbnail', 'thumbnail_variants']
+        read_only_fields = fields
+
 class CourseCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Course
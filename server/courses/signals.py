@@ -0,0 +1,81 @@
+# courses/signals.py
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+from core.images import variants_recorded
+from .models import Course, Module, Lesson, Quiz, Question, Choice
+from .answer_keys import invalidate_answer_key
+from .curriculum import bump_content_version
+from .quiz_payload import invalidate_quiz_payload
+from .rankings import refresh_rankings
+
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+def refresh_course_rankings(sender, instance, **kwargs):
+    # Publishing, archiving, rating and enrollment count changes can all
+    # reorder the homepage lists; rebuild once the write is visible.
+    transaction.on_commit(refresh_rankings)
+
+@receiver(variants_recorded, sender=Course)
+def refresh_rankings_for_variants(sender, **kwargs):
+    # Rankings are cached with the thumbnail variant URLs they were built with
+    transaction.on_commit(refresh_rankings)
+
+@receiver(post_save, sender=Module)
+@receiver(post_delete, sender=Module)
+def bump_course_version_for_module(sender, instance, **kwargs):
+    bump_content_version(Course.objects.filter(pk=instance.course_id))
+
+@receiver(post_save, sender=Lesson)
+@receiver(post_delete, sender=Lesson)
+def bump_course_version_for_lesson(sender, instance, **kwargs):
+    bump_content_version(Course.objects.filter(modules=instance.module_id))
+
+@receiver(post_save, sender=Quiz)
+@receiver(post_delete, sender=Quiz)
+def bump_course_version_for_quiz(sender, instance, **kwargs):
+    bump_content_version(Course.objects.filter(modules__lessons=instance.lesson_id))
+
+@receiver(post_save, sender=Quiz)
+@receiver(post_delete, sender=Quiz)
+def touch_lesson_for_quiz(sender, instance, **kwargs):
+    # Lesson payloads embed the quiz, so quiz edits must move lesson validators
+    Lesson.objects.filter(pk=instance.lesson_id).update(updated_at=timezone.now())
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def touch_lesson_for_question(sender, instance, **kwargs):
+    Lesson.objects.filter(quiz=instance.quiz_id).update(updated_at=timezone.now())
+
+@receiver(post_save, sender=Choice)
+@receiver(post_delete, sender=Choice)
+def touch_lesson_for_choice(sender, instance, **kwargs):
+    Lesson.objects.filter(quiz__questions=instance.question_id).update(updated_at=timezone.now())
+
+@receiver(post_save, sender=Quiz)
+@receiver(post_delete, sender=Quiz)
+def invalidate_quiz_caches_for_quiz(sender, instance, **kwargs):
+    invalidate_answer_key(instance.pk)
+    invalidate_quiz_payload(instance.pk)
+
+@receiver(post_save, sender=Lesson)
+def invalidate_answer_key_for_lesson(sender, instance, **kwargs):
+    # Answer keys carry the lesson's must_complete flag
+    quiz_id = Quiz.objects.filter(lesson=instance.pk).values_list('id', flat=True).first()
+    if quiz_id is not None:
+        invalidate_answer_key(quiz_id)
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def invalidate_quiz_caches_for_question(sender, instance, **kwargs):
+    invalidate_answer_key(instance.quiz_id)
+    invalidate_quiz_payload(instance.quiz_id)
+
+@receiver(post_save, sender=Choice)
+@receiver(post_delete, sender=Choice)
+def invalidate_quiz_caches_for_choice(sender, instance, **kwargs):
+    quiz_id = Question.objects.filter(pk=instance.question_id).values_list('quiz_id', flat=True).first()
+    if quiz_id is not None:
+        invalidate_answer_key(quiz_id)
+        invalidate_quiz_payload(quiz_id)
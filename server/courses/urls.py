@@ -14,6 +14,7 @@ router.register(r'choices', views.ChoiceViewSet, basename='choice')
 urlpatterns = [
     path('', include(router.urls)),
     path('search/', views.CourseSearchView.as_view({'get': 'list'}), name='course-search'),
+    path('autocomplete/', views.CourseAutocompleteView.as_view({'get': 'list'}), name='course-autocomplete'),
     path('featured/', views.CourseViewSet.as_view({'get': 'featured'}), name='featured-courses'),
     path('popular/', views.CourseViewSet.as_view({'get': 'popular'}), name='popular-courses'),
     path('recommended/', views.CourseViewSet.as_view({'get': 'recommended'}), name='recommended-courses'),
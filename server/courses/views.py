@@ -1,27 +1,69 @@
 # backend/courses/views.py
+import hashlib
+from urllib.parse import urlencode
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny, IsAdminUser, IsAuthenticatedOrReadOnly
+from rest_framework.throttling import ScopedRateThrottle
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q
+from django.conf import settings
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Max, Q
+from django.http import Http404
+from django.utils.cache import get_conditional_response
+from analytics.ingest import record_activity
+from core.pagination import CreatedAtKeysetPagination
+from .conditional import ConditionalGetMixin
+from .curriculum import get_curriculum
+from .facets import compute_facets
 from .models import CourseCategory, Course, Module, Lesson, Quiz, Question, Choice
+from .quiz_payload import get_quiz_payload, hide_timed_questions, shuffle_quiz_payload
+from .rankings import get_ranking
+from .recommendations import recommend_for_user
 from .serializers import (
-    CourseCategorySerializer, CourseSerializer, CourseCreateSerializer,
+    CourseCategorySerializer, CourseSerializer, CourseListSerializer, CourseCreateSerializer,
     ModuleSerializer, LessonSerializer, QuizSerializer, QuestionSerializer, ChoiceSerializer
 )
 
-class CourseCategoryViewSet(viewsets.ModelViewSet):
+# Query params that page or order results without changing facet counts
+FACETS_IGNORED_PARAMS = {'page', 'page_size', 'ordering', 'cursor', 'pagination', 'format'}
+
+def _lookup_id(value):
+    """Numeric id from a URL kwarg or query param, None when absent or malformed"""
+    return int(value) if value and str(value).isdigit() else None
+
+class CourseCategoryViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = CourseCategory.objects.all()
     serializer_class = CourseCategorySerializer
     permission_classes = [AllowAny]  # Changed from IsAuthenticated to AllowAny
     
+    def get_queryset(self):
+        # One grouped query instead of a COUNT per category
+        return super().get_queryset().annotate(course_count=Count('courses'))
+    
+    def get_validators(self):
+        if self.action == 'list':
+            # course_count is in the body; moving a course saves it, so its
+            # updated_at catches moves that leave the total unchanged
+            return CourseCategory.objects.aggregate(
+                updated=Max('updated_at'), count=Count('id', distinct=True),
+                courses=Count('courses'), courses_updated=Max('courses__updated_at'),
+            )
+        category_id = _lookup_id(self.kwargs.get('pk'))
+        if category_id is None:
+            return None
+        parts = CourseCategory.objects.filter(pk=category_id).aggregate(updated=Max('updated_at'), courses=Count('courses'))
+        return parts if parts['updated'] else None
+    
     def get_permissions(self):
         if self.action in ['create', 'update', 'partial_update', 'destroy']:
             return [IsAdminUser()]
         return [AllowAny()]  # Public access for list/retrieve actions
 
-class CourseViewSet(viewsets.ModelViewSet):
+class CourseViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Course.objects.filter(status='published')
     serializer_class = CourseSerializer
     permission_classes = [AllowAny]
@@ -30,10 +72,17 @@ class CourseViewSet(viewsets.ModelViewSet):
     search_fields = ['title', 'description', 'short_description', 'instructor__username']
     ordering_fields = ['created_at', 'price', 'average_rating', 'total_enrollments']
     ordering = ['-created_at']
+    pagination_class = CreatedAtKeysetPagination
     
     def get_queryset(self):
         queryset = super().get_queryset()
         
+        # Load only what the chosen representation renders
+        if self.action == 'list':
+            queryset = queryset.for_list()
+        elif self.action == 'retrieve':
+            queryset = queryset.for_detail()
+        
         # Filter by price
         price_filter = self.request.query_params.get('price')
         if price_filter == 'free':
@@ -48,6 +97,25 @@ class CourseViewSet(viewsets.ModelViewSet):
         
         return queryset
     
+    def get_validators(self):
+        """
+        Course, category, instructor and curriculum timestamps in one aggregate.
+        Enrollment and rating counter updates bump Course.updated_at as well.
+        """
+        course_id = _lookup_id(self.kwargs.get('pk'))
+        if self.action != 'retrieve' or course_id is None:
+            return None
+        parts = Course.objects.published().filter(pk=course_id).aggregate(
+            course=Max('updated_at'),
+            category=Max('category__updated_at'),
+            instructor=Max('instructor__updated_at'),
+            modules=Max('modules__updated_at'),
+            lessons=Max('modules__lessons__updated_at'),
+            module_count=Count('modules', distinct=True),
+            lesson_count=Count('modules__lessons', distinct=True),
+        )
+        return parts if parts['course'] else None
+    
     def get_permissions(self):
         if self.action in ['create', 'update', 'partial_update', 'destroy', 'enroll']:
             return [IsAdminUser()]
@@ -56,44 +124,87 @@ class CourseViewSet(viewsets.ModelViewSet):
     def get_serializer_class(self):
         if self.action in ['create', 'update', 'partial_update']:
             return CourseCreateSerializer
+        if self.action in ['list', 'featured', 'popular', 'recommended']:
+            return CourseListSerializer
         return CourseSerializer
     
     def perform_create(self, serializer):
         serializer.save(instructor=self.request.user)
     
+    def retrieve(self, request, *args, **kwargs):
+        response = super().retrieve(request, *args, **kwargs)
+        # 304s are views too; only missing courses are skipped
+        if response.status_code in (200, 304):
+            user = request.user if request.user.is_authenticated else None
+            record_activity('course_view', user=user, course=self.kwargs['pk'], request=request)
+        return response
+    
     @action(detail=False, methods=['get'])
     def featured(self, request):
-        """Get featured courses (public access)"""
-        featured_courses = Course.objects.filter(
-            status='published'
-        ).order_by('-average_rating', '-total_enrollments')[:8]
-        serializer = self.get_serializer(featured_courses, many=True)
-        return Response(serializer.data)
+        """Get featured courses (public access, served from the rankings cache)"""
+        return Response(get_ranking('featured', request))
 
     @action(detail=False, methods=['get'])
     def popular(self, request):
-        """Get popular courses (public access)"""
-        popular_courses = Course.objects.filter(
-            status='published'
-        ).order_by('-total_enrollments')[:8]
-        serializer = self.get_serializer(popular_courses, many=True)
-        return Response(serializer.data)
+        """Get popular courses (public access, served from the rankings cache)"""
+        return Response(get_ranking('popular', request))
     
     @action(detail=False, methods=['get'])
     def recommended(self, request):
         """Get recommended courses based on user's enrolled courses"""
-        user = request.user
-        # For now, return featured courses
-        # In production, implement recommendation algorithm
-        recommended_courses = Course.objects.filter(
-            status='published'
-        ).order_by('?')[:8]  # Random for demo
+        recommended_courses = []
+        if request.user.is_authenticated:
+            recommended_courses = recommend_for_user(request.user)
+        
+        # Anonymous and cold-start users get the popular list
+        if not recommended_courses:
+            return Response(get_ranking('popular', request))
+        
         serializer = self.get_serializer(recommended_courses, many=True)
         return Response(serializer.data)
     
+    @action(detail=False, methods=['get'])
+    def facets(self, request):
+        """Catalog sidebar counts for the current filters/search (public access)"""
+        params = sorted(
+            (key, sorted(values)) for key, values in request.query_params.lists()
+            if key not in FACETS_IGNORED_PARAMS
+        )
+        cache_key = 'courses:facets:' + hashlib.md5(urlencode(params, doseq=True).encode()).hexdigest()
+        
+        data = cache.get(cache_key)
+        if data is None:
+            data = compute_facets(self.filter_queryset(self.get_queryset()))
+            cache.set(cache_key, data, settings.COURSE_FACETS_CACHE_TTL)
+        return Response(data)
+    
+    @action(detail=True, methods=['get'])
+    def curriculum(self, request, pk=None):
+        """Compact module/lesson outline, cached per course content version"""
+        course_id = _lookup_id(pk)
+        version = Course.objects.published().filter(pk=course_id).values_list(
+            'content_version', flat=True
+        ).first() if course_id else None
+        
+        if version is None:
+            return Response(
+                {'detail': 'Course not found.'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        etag = f'"curriculum-{course_id}-{version}"'
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+        
+        response = Response(get_curriculum(course_id, version))
+        response['ETag'] = etag
+        return response
+    
     @action(detail=True, methods=['post'])
     def enroll(self, request, pk=None):
         """Enroll current user in course"""
+        from enrollments.counters import record_enrollment
         from enrollments.models import Enrollment
         course = self.get_object()
         
@@ -108,38 +219,70 @@ class CourseViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Create enrollment
-        enrollment = Enrollment.objects.create(
-            user=request.user,
-            course=course
-        )
-        
-        # Increment course enrollment count
-        course.total_enrollments += 1
-        course.save()
+        # Create enrollment and count it on a counter shard, not the course row
+        with transaction.atomic():
+            enrollment = Enrollment.objects.create(
+                user=request.user,
+                course=course
+            )
+            record_enrollment(course.id)
+        record_activity('course_enroll', user=request.user, course=course, request=request)
         
         return Response(
             {'detail': 'Successfully enrolled in course.', 'enrollment_id': enrollment.id},
             status=status.HTTP_201_CREATED
         )
 
-class ModuleViewSet(viewsets.ReadOnlyModelViewSet):
+class ModuleViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     serializer_class = ModuleSerializer
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['course']
     
+    def get_validators(self):
+        if self.action == 'list':
+            course_id = _lookup_id(self.request.query_params.get('course'))
+            if course_id is None:
+                return None
+            modules = Module.objects.filter(course=course_id)
+        else:
+            module_id = _lookup_id(self.kwargs.get('pk'))
+            if module_id is None:
+                return None
+            modules = Module.objects.filter(pk=module_id)
+        parts = modules.aggregate(
+            modules=Max('updated_at'),
+            lessons=Max('lessons__updated_at'),
+            module_count=Count('id', distinct=True),
+            lesson_count=Count('lessons', distinct=True),
+        )
+        return parts if parts['modules'] or self.action == 'list' else None
+    
     def get_queryset(self):
-        return Module.objects.all().order_by('order')
+        return Module.objects.prefetch_related('lessons__quiz').order_by('order')
 
-class LessonViewSet(viewsets.ReadOnlyModelViewSet):
+class LessonViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     serializer_class = LessonSerializer
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['module']
     
+    def get_validators(self):
+        if self.action == 'list':
+            module_id = _lookup_id(self.request.query_params.get('module'))
+            if module_id is None:
+                return None
+            lessons = Lesson.objects.filter(module=module_id)
+        else:
+            lesson_id = _lookup_id(self.kwargs.get('pk'))
+            if lesson_id is None:
+                return None
+            lessons = Lesson.objects.filter(pk=lesson_id)
+        parts = lessons.aggregate(lessons=Max('updated_at'), lesson_count=Count('id'))
+        return parts if parts['lessons'] or self.action == 'list' else None
+    
     def get_queryset(self):
-        return Lesson.objects.all().order_by('order')
+        return Lesson.objects.select_related('quiz').order_by('order')
 
 class QuizViewSet(viewsets.ModelViewSet):
     queryset = Quiz.objects.all()
@@ -150,12 +293,37 @@ class QuizViewSet(viewsets.ModelViewSet):
         if self.action in ['create', 'update', 'partial_update', 'destroy']:
             return [IsAdminUser()]
         return super().get_permissions()
+    
+    @action(detail=True, methods=['get'])
+    def take(self, request, pk=None):
+        """
+        Learner-safe quiz served from cache; ?seed= shuffles questions and
+        choices. Timed quizzes come without questions; learners get those
+        from starting an attempt, which starts the clock.
+        """
+        quiz_id = _lookup_id(pk)
+        payload = get_quiz_payload(quiz_id) if quiz_id is not None else None
+        if payload is None:
+            raise Http404
+        seed = request.query_params.get('seed')
+        if seed:
+            payload = shuffle_quiz_payload(payload, seed)
+        if not request.user.is_staff:
+            payload = hide_timed_questions(payload)
+        return Response(payload)
 
 class QuestionViewSet(viewsets.ModelViewSet):
     queryset = Question.objects.all()
     serializer_class = QuestionSerializer
     permission_classes = [IsAuthenticated]
     
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        # Timed quizzes' questions are only served by starting an attempt
+        if not self.request.user.is_staff:
+            queryset = queryset.filter(Q(quiz__time_limit__isnull=True) | Q(quiz__time_limit=0))
+        return queryset
+    
     def get_permissions(self):
         if self.action in ['create', 'update', 'partial_update', 'destroy']:
             return [IsAdminUser()]
@@ -166,6 +334,12 @@ class ChoiceViewSet(viewsets.ModelViewSet):
     serializer_class = ChoiceSerializer
     permission_classes = [IsAuthenticated]
     
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if not self.request.user.is_staff:
+            queryset = queryset.filter(Q(question__quiz__time_limit__isnull=True) | Q(question__quiz__time_limit=0))
+        return queryset
+    
     def get_permissions(self):
         if self.action in ['create', 'update', 'partial_update', 'destroy']:
             return [IsAdminUser()]
@@ -173,19 +347,61 @@ class ChoiceViewSet(viewsets.ModelViewSet):
 
 class CourseSearchView(viewsets.GenericViewSet):
     permission_classes = [AllowAny]  # Make search public too
+    serializer_class = CourseListSerializer
+    
+    def get_queryset(self):
+        query = self.request.query_params.get('search', '').strip()
+        return Course.objects.published().search(query).for_list()
     
     def list(self, request):
-        query = request.query_params.get('search', '')
+        query = request.query_params.get('search', '').strip()
         
         if not query:
             return Response({'results': []})
         
-        courses = Course.objects.filter(
-            Q(title__icontains=query) |
-            Q(description__icontains=query) |
-            Q(short_description__icontains=query) |
-            Q(category__name__icontains=query)
-        ).filter(status='published')
+        # GIN-indexed tsvector match, ordered by weighted rank
+        queryset = self.get_queryset()
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        
+        serializer = self.get_serializer(queryset, many=True)
+        return Response({'results': serializer.data})
+
+class CourseAutocompleteView(viewsets.GenericViewSet):
+    """Typeahead over course titles and category names, backed by trigram indexes"""
+    permission_classes = [AllowAny]
+    throttle_classes = [ScopedRateThrottle]
+    throttle_scope = 'autocomplete'
+    min_length = 2
+    
+    def list(self, request):
+        query = ' '.join(request.query_params.get('q', '').lower().split())[:100]
+        
+        if len(query) < self.min_length:
+            return Response({'results': []})
+        
+        cache_key = f'courses:autocomplete:{query}'
+        results = cache.get(cache_key)
+        if results is None:
+            # Category matches resolve against the small category table first
+            matching_categories = CourseCategory.objects.filter(
+                name__trigram_word_similar=query
+            ).values('id')
+            
+            # Only predicates the trigram GIN index serves; icontains would
+            # compile to UPPER(title) LIKE and force a sequential scan
+            results = list(
+                Course.objects.published().filter(
+                    Q(title__trigram_word_similar=query) |
+                    Q(category__in=matching_categories)
+                ).annotate(
+                    similarity=TrigramWordSimilarity(query, 'title')
+                ).order_by('-similarity', '-total_enrollments').values(
+                    'id', 'slug', 'title'
+                )[:settings.COURSE_AUTOCOMPLETE_LIMIT]
+            )
+            cache.set(cache_key, results, settings.COURSE_AUTOCOMPLETE_CACHE_TTL)
         
-        serializer = CourseSerializer(courses, many=True)
-        return Response({'results': serializer.data}) 
\ No newline at end of file
+        return Response({'results': results})
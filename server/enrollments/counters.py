@@ -0,0 +1,83 @@
+# enrollments/counters.py
+import random
+from collections import defaultdict
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Now
+from courses.models import Course
+from courses.rankings import refresh_rankings
+from .models import CourseEnrollmentCounter, Enrollment
+
+def record_enrollment(course_id, amount=1):
+    """
+    Add ``amount`` to a random counter shard of the course.
+
+    Runs as a single upsert, so concurrent enrollments only contend when
+    they land on the same shard and never touch the Course row itself.
+    """
+    table = CourseEnrollmentCounter._meta.db_table
+    shard = random.randrange(settings.ENROLLMENT_COUNTER_SHARDS)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {table} (course_id, shard, delta) VALUES (%s, %s, %s) '
+            f'ON CONFLICT (course_id, shard) DO UPDATE SET delta = {table}.delta + EXCLUDED.delta',
+            [course_id, shard, amount],
+        )
+
+def fold_enrollment_counters():
+    """
+    Move all pending deltas into Course.total_enrollments. The analytics
+    rollup counts Enrollment rows itself and isn't touched here.
+
+    The shard rows are claimed with DELETE ... RETURNING, so increments that
+    arrive during the fold start fresh rows and are picked up next time.
+    """
+    table = CourseEnrollmentCounter._meta.db_table
+    pending = defaultdict(int)
+    
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {table} RETURNING course_id, delta')
+            for course_id, delta in cursor.fetchall():
+                pending[course_id] += delta
+        
+        for course_id, delta in pending.items():
+            if not delta:
+                continue
+            # updated_at moves too, so course detail ETags change with the total
+            Course.objects.filter(pk=course_id).update(total_enrollments=F('total_enrollments') + delta, updated_at=Now())
+    
+    if pending:
+        # Queryset updates skip post_save, so refresh the homepage lists here
+        transaction.on_commit(refresh_rankings)
+    
+    return len(pending)
+
+def reconcile_enrollments(course_ids=None):
+    """
+    Recompute Course.total_enrollments from Enrollment rows to correct drift.
+
+    The shard table is locked against new deltas for the duration and the
+    courses' pending deltas are discarded, since the recount already
+    includes them; enrollments waiting on the lock commit afterwards and
+    reach the total through the next fold.
+    """
+    table = CourseEnrollmentCounter._meta.db_table
+    enrollments = Enrollment.objects.filter(course=OuterRef('pk')).order_by().values('course')
+    courses = Course.objects.all()
+    pending = CourseEnrollmentCounter.objects.all()
+    if course_ids is not None:
+        courses = courses.filter(pk__in=course_ids)
+        pending = pending.filter(course_id__in=course_ids)
+    
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(f'LOCK TABLE {table} IN SHARE ROW EXCLUSIVE MODE')
+        pending.delete()
+        updated = courses.update(
+            total_enrollments=Coalesce(Subquery(enrollments.annotate(n=Count('id')).values('n')), Value(0)),
+            updated_at=Now(),
+        )
+    refresh_rankings()
+    return updated
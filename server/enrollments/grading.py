@@ -0,0 +1,172 @@
+# enrollments/grading.py
+"""
+Server-side quiz grading.
+
+Starting a quiz opens a QuizAttempt row: it claims the attempt number (so
+starts count against max_attempts), records the start time server-side and
+closes any earlier unfinished attempt of the same quiz. The signed start
+token only names that attempt, and submitting finishes it with a
+conditional UPDATE, so a token works once and only for the latest start.
+Timed quizzes must be started; untimed ones may also be submitted directly.
+
+Grading runs against the cached answer key outside any transaction; the
+only locks taken are the learner's own counter and attempt rows for that
+quiz, so submissions from different learners never wait on each other.
+"""
+from django.conf import settings
+from django.core import signing
+from django.db import connection, transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from courses.answer_keys import get_answer_key, normalize_answer
+from .models import LessonProgress, QuizAttempt, QuizAttemptCounter
+from .progress import record_lesson_start, set_lesson_completed
+
+START_TOKEN_SALT = 'enrollments.quiz-start'
+
+def _answer_key_for(enrollment, quiz_id):
+    answer_key = get_answer_key(quiz_id)
+    if answer_key is None or answer_key['course_id'] != enrollment.course_id:
+        raise ValidationError({'quiz': 'Quiz does not belong to enrolled course.'})
+    return answer_key
+
+def read_start_token(token, enrollment, quiz_id):
+    """The id of the attempt the token was issued for"""
+    try:
+        payload = signing.loads(token, salt=START_TOKEN_SALT)
+    except signing.BadSignature:
+        raise ValidationError({'token': 'Invalid start token.'})
+    if payload.get('enrollment') != enrollment.id or payload.get('quiz') != quiz_id:
+        raise ValidationError({'token': 'Start token was issued for a different quiz.'})
+    return payload['attempt']
+
+def grade_answers(answer_key, answers):
+    """
+    Score ``answers`` ({question id: choice id, list of choice ids, or text})
+    against an answer key in one pass. Returns (score percentage, {question id: correct}).
+    """
+    answers = {str(question_id): answer for question_id, answer in answers.items()}
+    earned = 0
+    results = {}
+
+    for question_id, question in answer_key['questions'].items():
+        given = answers.get(str(question_id))
+        if question['type'] == 'short_answer':
+            correct = given is not None and normalize_answer(given) in question['accepted']
+        else:
+            chosen = given if isinstance(given, list) else [given]
+            chosen = {int(choice) for choice in chosen if str(choice).isdigit()}
+            correct = bool(question['correct']) and chosen == question['correct']
+        if correct:
+            earned += question['points']
+        results[question_id] = correct
+
+    total = answer_key['total_points']
+    score = round(earned * 100.0 / total, 2) if total else 0.0
+    return score, results
+
+def claim_attempt(enrollment_id, quiz_id, max_attempts):
+    """
+    Take the next attempt number for (enrollment, quiz), or None when
+    ``max_attempts`` are used up. The upsert locks only this pair's counter
+    row until commit, so numbering is race-free without serializing other
+    quizzes or learners.
+    """
+    table = QuizAttemptCounter._meta.db_table
+    limit = f'WHERE {table}.attempts < %s ' if max_attempts else ''
+    params = [enrollment_id, quiz_id] + ([max_attempts] if max_attempts else [])
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {table} (enrollment_id, quiz_id, attempts) VALUES (%s, %s, 1) '
+            f'ON CONFLICT (enrollment_id, quiz_id) DO UPDATE SET attempts = {table}.attempts + 1 '
+            f'{limit}RETURNING attempts',
+            params,
+        )
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+def _claim_or_fail(enrollment, quiz_id, answer_key):
+    attempt_number = claim_attempt(enrollment.id, quiz_id, answer_key['max_attempts'])
+    if attempt_number is None:
+        raise ValidationError({'detail': 'Maximum number of attempts reached.'})
+    return attempt_number
+
+def _finish_attempt(attempt_id, **values):
+    """Complete an open attempt; returns False if it was already finished or replaced"""
+    return bool(QuizAttempt.objects.filter(pk=attempt_id, completed_at__isnull=True).update(**values))
+
+def start_attempt(enrollment, quiz_id):
+    """Open a new attempt and return (attempt, start token, answer key)"""
+    answer_key = _answer_key_for(enrollment, quiz_id)
+    with transaction.atomic():
+        attempt_number = _claim_or_fail(enrollment, quiz_id, answer_key)
+        # A restart abandons the previous start; its token stops working
+        QuizAttempt.objects.filter(enrollment=enrollment, quiz_id=quiz_id, completed_at__isnull=True).update(
+            completed_at=timezone.now()
+        )
+        attempt = QuizAttempt.objects.create(
+            enrollment=enrollment, quiz_id=quiz_id, score=0, attempt_number=attempt_number,
+        )
+    token = signing.dumps(
+        {'enrollment': enrollment.id, 'quiz': quiz_id, 'attempt': attempt.id},
+        salt=START_TOKEN_SALT,
+    )
+    return attempt, token, answer_key
+
+def submit_quiz(enrollment, quiz_id, answers, token=None):
+    """
+    Grade a submission and record it, finishing the started attempt when a
+    token is given. The QuizAttempt and the LessonProgress update are
+    written together; LessonProgress keeps the best score and is completed
+    by the first passing attempt.
+    """
+    answer_key = _answer_key_for(enrollment, quiz_id)
+
+    started = None
+    if token:
+        started = QuizAttempt.objects.filter(
+            pk=read_start_token(token, enrollment, quiz_id), completed_at__isnull=True
+        ).only('id', 'attempt_number', 'started_at').first()
+        if started is None:
+            raise ValidationError({'token': 'This attempt was already submitted or replaced by a newer start.'})
+    elif answer_key['time_limit']:
+        raise ValidationError({'token': 'This quiz is timed; start it before submitting.'})
+
+    now = timezone.now()
+    time_taken = max(0, int((now - started.started_at).total_seconds())) if started else 0
+    if answer_key['time_limit'] and time_taken > answer_key['time_limit'] * 60 + settings.QUIZ_TIME_LIMIT_GRACE:
+        # The late attempt stays used up, with its zero score
+        _finish_attempt(started.id, completed_at=now, time_taken=time_taken)
+        raise ValidationError({'detail': 'Time limit exceeded.'})
+
+    score, results = grade_answers(answer_key, answers)
+    passed = score >= answer_key['passing_score']
+
+    with transaction.atomic():
+        if started is None:
+            attempt = QuizAttempt.objects.create(
+                enrollment=enrollment,
+                quiz_id=quiz_id,
+                score=score,
+                passed=passed,
+                attempt_number=_claim_or_fail(enrollment, quiz_id, answer_key),
+                completed_at=now,
+                time_taken=time_taken,
+            )
+        else:
+            if not _finish_attempt(started.id, score=score, passed=passed, completed_at=now, time_taken=time_taken):
+                raise ValidationError({'token': 'This attempt was already submitted or replaced by a newer start.'})
+            attempt = started
+            attempt.enrollment, attempt.quiz_id = enrollment, quiz_id
+            attempt.score, attempt.passed, attempt.completed_at, attempt.time_taken = score, passed, now, time_taken
+
+        progress, created = LessonProgress.objects.get_or_create(enrollment=enrollment, lesson_id=answer_key['lesson_id'])
+        if created:
+            record_lesson_start(enrollment, answer_key['lesson_id'])
+        if progress.score is None or score > progress.score:
+            progress.score = score
+            progress.save(update_fields=['score', 'last_accessed_at'])
+        if passed:
+            set_lesson_completed(progress, True, answer_key['must_complete'])
+
+    return attempt, results, answer_key
@@ -0,0 +1,136 @@
+# enrollments/heartbeats.py
+"""
+Write-coalescing buffer for player heartbeats.
+
+Heartbeats only add to an in-process dict keyed by (enrollment, lesson);
+a background thread flushes the accumulated time_spent increments and the
+latest playback positions as one multi-row upsert per batch. Database
+writes therefore scale with the number of distinct lessons being watched
+per flush interval, not with how often players ping. A crash loses at most
+one interval of watch time.
+"""
+import atexit
+import logging
+import threading
+from django.conf import settings
+from django.db import close_old_connections, connection
+from django.utils import timezone
+from analytics.ingest import record_activity
+from .models import Enrollment, LessonProgress
+
+logger = logging.getLogger(__name__)
+
+UPSERT_BATCH_SIZE = 1000
+
+def write_heartbeats(pending):
+    """
+    Upsert {(enrollment_id, lesson_id): [seconds, position]} into
+    LessonProgress. Returns the keys whose row this upsert created.
+    """
+    table = LessonProgress._meta.db_table
+    now = timezone.now()
+    # Every writer upserts in key order, so overlapping flushes from several
+    # workers lock rows in the same order and can't deadlock
+    rows = sorted(pending.items())
+    created = []
+    with connection.cursor() as cursor:
+        for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+            batch = rows[start:start + UPSERT_BATCH_SIZE]
+            placeholders = ', '.join(['(%s, %s, false, %s, %s, %s)'] * len(batch))
+            params = []
+            for (enrollment_id, lesson_id), (seconds, position) in batch:
+                params.extend([enrollment_id, lesson_id, seconds, position, now])
+            cursor.execute(
+                f'INSERT INTO {table} (enrollment_id, lesson_id, completed, time_spent, last_position, last_accessed_at) '
+                f'VALUES {placeholders} '
+                f'ON CONFLICT (enrollment_id, lesson_id) DO UPDATE SET '
+                f'time_spent = {table}.time_spent + EXCLUDED.time_spent, '
+                f'last_position = COALESCE(EXCLUDED.last_position, {table}.last_position), '
+                f'last_accessed_at = EXCLUDED.last_accessed_at '
+                # xmax is 0 only on rows this statement inserted rather than updated
+                f'RETURNING enrollment_id, lesson_id, (xmax = 0)',
+                params,
+            )
+            created.extend((enrollment_id, lesson_id) for enrollment_id, lesson_id, inserted in cursor.fetchall() if inserted)
+    return created
+
+def record_lesson_starts(keys):
+    """lesson_start events for newly created (enrollment_id, lesson_id) rows"""
+    owners = {
+        enrollment_id: (user_id, course_id)
+        for enrollment_id, user_id, course_id in Enrollment.objects.filter(
+            pk__in={enrollment_id for enrollment_id, _ in keys}
+        ).values_list('id', 'user_id', 'course_id')
+    }
+    for enrollment_id, lesson_id in keys:
+        if enrollment_id in owners:
+            user_id, course_id = owners[enrollment_id]
+            record_activity('lesson_start', user=user_id, course=course_id, lesson=lesson_id)
+
+class HeartbeatBuffer:
+    def __init__(self, interval, max_pending):
+        self.interval = interval
+        self.max_pending = max_pending
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def add(self, enrollment_id, lesson_id, seconds, position=None):
+        with self._lock:
+            entry = self._pending.setdefault((enrollment_id, lesson_id), [0, None])
+            entry[0] += seconds
+            if position is not None:
+                entry[1] = position
+            full = len(self._pending) >= self.max_pending
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='lesson-heartbeats', daemon=True)
+                self._thread.start()
+        if full:
+            self._wake.set()
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if pending:
+            try:
+                created = write_heartbeats(pending)
+            except Exception:
+                self._restore(pending)
+                raise
+            if created:
+                record_lesson_starts(created)
+        return len(pending)
+
+    def _restore(self, pending):
+        """Merge an unwritten batch back so the next flush retries it"""
+        with self._lock:
+            for key, (seconds, position) in pending.items():
+                entry = self._pending.setdefault(key, [0, None])
+                entry[0] += seconds
+                # Positions buffered since are newer than the failed batch's
+                if entry[1] is None:
+                    entry[1] = position
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            close_old_connections()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception('Flushing lesson heartbeats failed')
+
+buffer = HeartbeatBuffer(
+    interval=settings.LESSON_HEARTBEAT_FLUSH_INTERVAL,
+    max_pending=settings.LESSON_HEARTBEAT_MAX_PENDING,
+)
+
+def _flush_on_exit():
+    try:
+        buffer.flush()
+    except Exception:
+        logger.exception('Flushing lesson heartbeats on shutdown failed')
+
+atexit.register(_flush_on_exit)
@@ -0,0 +1,9 @@
+from django.core.management.base import BaseCommand
+from enrollments.counters import fold_enrollment_counters
+
+class Command(BaseCommand):
+    help = 'Fold sharded enrollment counters into Course.total_enrollments (run on a schedule)'
+    
+    def handle(self, *args, **options):
+        folded = fold_enrollment_counters()
+        self.stdout.write(self.style.SUCCESS(f'Folded enrollment counters for {folded} courses'))
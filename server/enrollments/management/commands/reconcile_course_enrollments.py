@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from enrollments.counters import reconcile_enrollments
+
+class Command(BaseCommand):
+    help = 'Recompute Course.total_enrollments from Enrollment rows to correct drift'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('course_ids', nargs='*', type=int, help='Limit to these courses (default: all)')
+    
+    def handle(self, *args, **options):
+        updated = reconcile_enrollments(options['course_ids'] or None)
+        self.stdout.write(self.style.SUCCESS(f'Reconciled enrollment totals for {updated} courses'))
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from enrollments.reviews import reconcile_ratings
+
+class Command(BaseCommand):
+    help = 'Recompute Course.average_rating and total_reviews from CourseReview to correct drift'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('course_ids', nargs='*', type=int, help='Limit to these courses (default: all)')
+    
+    def handle(self, *args, **options):
+        updated = reconcile_ratings(options['course_ids'] or None)
+        self.stdout.write(self.style.SUCCESS(f'Reconciled ratings for {updated} courses'))
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from enrollments.progress import reconcile_progress
+
+class Command(BaseCommand):
+    help = 'Recompute required/completed lesson counters and progress percentages from LessonProgress to correct drift'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('course_ids', nargs='*', type=int, help='Limit to these courses (default: all)')
+    
+    def handle(self, *args, **options):
+        updated = reconcile_progress(options['course_ids'] or None)
+        self.stdout.write(self.style.SUCCESS(f'Reconciled progress for {updated} enrollments'))
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.9 on 2026-10-18 02:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0004_coursesimilarity'),
+        ('enrollments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseEnrollmentCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('shard', models.PositiveSmallIntegerField()),
+                ('delta', models.IntegerField(default=0)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='courses.course')),
+            ],
+            options={
+                'unique_together': {('course', 'shard')},
+            },
+        ),
+    ]
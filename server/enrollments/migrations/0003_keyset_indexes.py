@@ -0,0 +1,24 @@
+# Generated by Django 5.2.9 on 2026-10-18 02:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0007_keyset_indexes'),
+        ('enrollments', '0002_courseenrollmentcounter'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(fields=['user', '-enrolled_at', '-id'], name='enrollments_user_id_2355e2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(fields=['-enrolled_at', '-id'], name='enrollments_enrolle_754bc9_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.9 on 2026-10-18 02:29
+
+from django.db import migrations, models
+
+BACKFILL_COMPLETED_LESSONS_SQL = """
+UPDATE enrollments_enrollment e SET completed_lessons = (
+    SELECT COUNT(*) FROM enrollments_lessonprogress p
+    JOIN courses_lesson l ON l.id = p.lesson_id
+    WHERE p.enrollment_id = e.id AND p.completed AND l.must_complete
+);
+UPDATE enrollments_enrollment e
+SET progress_percentage = LEAST(e.completed_lessons * 100.0 / c.required_lessons, 100.0)
+FROM courses_course c
+WHERE c.id = e.course_id AND c.required_lessons > 0;
+"""
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0008_course_required_lessons'),
+        ('enrollments', '0004_coursereview'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='enrollment',
+            name='completed_lessons',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunSQL(BACKFILL_COMPLETED_LESSONS_SQL, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.9 on 2026-10-18 02:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('enrollments', '0005_enrollment_completed_lessons'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lessonprogress',
+            name='last_position',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.9 on 2026-10-18 02:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+BACKFILL_FURTHEST_LESSON_SQL = """
+UPDATE enrollments_enrollment e SET furthest_lesson_id = (
+    SELECT p.lesson_id FROM enrollments_lessonprogress p
+    JOIN courses_lesson l ON l.id = p.lesson_id
+    JOIN courses_module m ON m.id = l.module_id
+    WHERE p.enrollment_id = e.id AND p.completed
+    ORDER BY m."order" DESC, m.id DESC, l."order" DESC, l.id DESC
+    LIMIT 1
+);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0008_course_required_lessons'),
+        ('enrollments', '0006_lessonprogress_last_position'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='enrollment',
+            name='furthest_lesson',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='courses.lesson'),
+        ),
+        migrations.RunSQL(BACKFILL_FURTHEST_LESSON_SQL, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.9 on 2026-10-18 02:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Client-posted attempt numbers may repeat; renumber by start time so the
+# unique constraint can be added
+RENUMBER_ATTEMPTS_SQL = """
+UPDATE enrollments_quizattempt a SET attempt_number = ranked.n
+FROM (
+    SELECT id, ROW_NUMBER() OVER (PARTITION BY enrollment_id, quiz_id ORDER BY started_at, id) AS n
+    FROM enrollments_quizattempt
+) ranked
+WHERE ranked.id = a.id AND a.attempt_number <> ranked.n;
+"""
+
+BACKFILL_COUNTERS_SQL = """
+INSERT INTO enrollments_quizattemptcounter (enrollment_id, quiz_id, attempts)
+SELECT enrollment_id, quiz_id, COUNT(*) FROM enrollments_quizattempt GROUP BY enrollment_id, quiz_id;
+"""
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0008_course_required_lessons'),
+        ('enrollments', '0007_enrollment_furthest_lesson'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuizAttemptCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('attempts', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='quizattempt',
+            index=models.Index(fields=['enrollment', 'quiz', '-score', '-id'], name='enrollments_enrollm_7b88cd_idx'),
+        ),
+        migrations.RunSQL(RENUMBER_ATTEMPTS_SQL, migrations.RunSQL.noop),
+        migrations.AddConstraint(
+            model_name='quizattempt',
+            constraint=models.UniqueConstraint(fields=('enrollment', 'quiz', 'attempt_number'), name='unique_quiz_attempt_number'),
+        ),
+        migrations.AddField(
+            model_name='quizattemptcounter',
+            name='enrollment',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='enrollments.enrollment'),
+        ),
+        migrations.AddField(
+            model_name='quizattemptcounter',
+            name='quiz',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='courses.quiz'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='quizattemptcounter',
+            unique_together={('enrollment', 'quiz')},
+        ),
+        migrations.RunSQL(BACKFILL_COUNTERS_SQL, migrations.RunSQL.noop),
+    ]
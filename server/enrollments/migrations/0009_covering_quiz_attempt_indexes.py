@@ -0,0 +1,30 @@
+# Generated by Django 5.2.9 on 2026-10-18 02:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0009_course_thumbnail_digest'),
+        ('enrollments', '0008_quizattemptcounter'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='quizattempt',
+            name='unique_quiz_attempt_number',
+        ),
+        migrations.RemoveIndex(
+            model_name='quizattempt',
+            name='enrollments_enrollm_7b88cd_idx',
+        ),
+        migrations.AddIndex(
+            model_name='quizattempt',
+            index=models.Index(fields=['enrollment', 'quiz', '-score', '-id'], include=('attempt_number', 'passed', 'completed_at', 'time_taken'), name='enrollments_enrollm_7b88cd_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='quizattempt',
+            constraint=models.UniqueConstraint(fields=('enrollment', 'quiz', 'attempt_number'), include=('id', 'score', 'passed', 'completed_at', 'time_taken'), name='unique_quiz_attempt_number'),
+        ),
+    ]
@@ -1,7 +1,23 @@
 from django.db import models
+from django.core.validators import MinValueValidator, MaxValueValidator
 from user.models import Users
 from courses.models import Course, Lesson, Quiz
 
+class EnrollmentQuerySet(models.QuerySet):
+    def for_list(self):
+        """Compact rows: enrollment plus the course card columns in one joined query"""
+        return self.select_related('course').only(
+            'id', 'user', 'enrolled_at', 'completed_at', 'progress_percentage', 'completed_lessons',
+            'is_completed', 'last_accessed_at', 'status',
+            'course__title', 'course__slug', 'course__thumbnail', 'course__thumbnail_digest',
+        )
+    
+    def for_detail(self):
+        """Nested user and course curriculum: joins plus one query per tree level"""
+        return self.select_related('user', 'course__instructor', 'course__category').defer(
+            'course__search_vector'
+        ).prefetch_related('course__modules__lessons__quiz')
+
 class Enrollment(models.Model):
     STATUS_CHOICES = [
         ('active', 'Active'),
@@ -14,17 +30,38 @@ class Enrollment(models.Model):
     enrolled_at = models.DateTimeField(auto_now_add=True)
     completed_at = models.DateTimeField(null=True, blank=True)
     progress_percentage = models.FloatField(default=0.0)
+    completed_lessons = models.PositiveIntegerField(default=0, editable=False)  # required lessons only, see enrollments.progress
+    # Completed lesson latest in the course sequence; resume starts after it
+    furthest_lesson = models.ForeignKey(Lesson, on_delete=models.SET_NULL, null=True, blank=True, editable=False, related_name='+')
     is_completed = models.BooleanField(default=False)
     last_accessed_at = models.DateTimeField(auto_now=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='active')
     
+    objects = EnrollmentQuerySet.as_manager()
+    
     class Meta:
         unique_together = ['user', 'course']
         ordering = ['-enrolled_at']
+        indexes = [
+            models.Index(fields=['user', '-enrolled_at', '-id']),
+            models.Index(fields=['-enrolled_at', '-id']),
+        ]
     
     def __str__(self):
         return f"{self.user.username} - {self.course.title}"
 
+class CourseEnrollmentCounter(models.Model):
+    """Pending Course.total_enrollments deltas, sharded so concurrent enrollments don't queue on one row"""
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='+')
+    shard = models.PositiveSmallIntegerField()
+    delta = models.IntegerField(default=0)
+    
+    class Meta:
+        unique_together = ['course', 'shard']
+    
+    def __str__(self):
+        return f"{self.course_id}[{self.shard}] {self.delta:+d}"
+
 class LessonProgress(models.Model):
     enrollment = models.ForeignKey(Enrollment, on_delete=models.CASCADE, related_name='lesson_progress')
     lesson = models.ForeignKey(Lesson, on_delete=models.CASCADE, related_name='progress')
@@ -32,6 +69,7 @@ class LessonProgress(models.Model):
     completed_at = models.DateTimeField(null=True, blank=True)
     score = models.FloatField(null=True, blank=True)  # For quizzes
     time_spent = models.IntegerField(default=0)  # in seconds
+    last_position = models.IntegerField(null=True, blank=True)  # playback position in seconds, from heartbeats
     last_accessed_at = models.DateTimeField(auto_now=True)
     
     class Meta:
@@ -52,6 +90,51 @@ class QuizAttempt(models.Model):
     
     class Meta:
         ordering = ['-started_at']
+        # Both indexes carry the columns the attempt summary reads, so the
+        # latest (unique constraint) and best attempt are index-only probes
+        constraints = [
+            models.UniqueConstraint(
+                fields=['enrollment', 'quiz', 'attempt_number'], name='unique_quiz_attempt_number',
+                include=['id', 'score', 'passed', 'completed_at', 'time_taken'],
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=['enrollment', 'quiz', '-score', '-id'], name='enrollments_enrollm_7b88cd_idx',
+                include=['attempt_number', 'passed', 'completed_at', 'time_taken'],
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.enrollment.user.username} - {self.quiz.title} - Attempt {self.attempt_number}"
+
+class QuizAttemptCounter(models.Model):
+    """Attempts used per enrollment and quiz; incremented by an upsert that also enforces Quiz.max_attempts"""
+    enrollment = models.ForeignKey(Enrollment, on_delete=models.CASCADE, related_name='+')
+    quiz = models.ForeignKey(Quiz, on_delete=models.CASCADE, related_name='+')
+    attempts = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        unique_together = ['enrollment', 'quiz']
+    
+    def __str__(self):
+        return f"{self.enrollment_id}/{self.quiz_id}: {self.attempts}"
+
+class CourseReview(models.Model):
+    """One rating per enrollment; Course.average_rating/total_reviews are maintained from these incrementally"""
+    enrollment = models.OneToOneField(Enrollment, on_delete=models.CASCADE, related_name='review')
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='reviews')
+    user = models.ForeignKey(Users, on_delete=models.CASCADE, related_name='course_reviews')
+    rating = models.PositiveSmallIntegerField(validators=[MinValueValidator(1), MaxValueValidator(5)])
+    comment = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['course', '-created_at']),
+        ]
     
     def __str__(self):
-        return f"{self.enrollment.user.username} - {self.quiz.title} - Attempt {self.attempt_number}"
\ No newline at end of file
+        return f"{self.user.username} - {self.course.title} ({self.rating}/5)"
@@ -0,0 +1,113 @@
+# enrollments/progress.py
+from django.db import transaction
+from django.db.models import Case, Count, F, FloatField, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce, Least
+from django.db.models.lookups import GreaterThan
+from django.utils import timezone
+from analytics.dashboard import invalidate_dashboard
+from analytics.ingest import record_activity
+from courses.curriculum import get_lesson_sequence
+from courses.models import Course, Lesson
+from .models import Enrollment, LessonProgress
+
+# Enrollment.completed_lessons counts completed must_complete lessons and
+# Course.required_lessons counts must_complete lessons, so recording progress
+# is one UPDATE on the enrollment row instead of a recount of the course.
+
+def _percentage(completed, required):
+    return Case(
+        When(GreaterThan(required, 0), then=Least(completed * 100.0 / required, Value(100.0))),
+        default=Value(0.0),
+        output_field=FloatField(),
+    )
+
+def record_lesson_completion(enrollment, completed, required):
+    """Move the enrollment's counter by one required lesson and finish the course on the last one"""
+    count = F('completed_lessons') + (1 if completed else -1)
+    changes = {
+        'completed_lessons': count,
+        'progress_percentage': _percentage(count, Value(required)),
+        'last_accessed_at': timezone.now(),
+    }
+    # SET clauses and conditions all see the row before this UPDATE
+    if completed and required:
+        finishing = Q(completed_lessons__gte=required - 1, is_completed=False)
+        changes.update(
+            is_completed=Case(When(finishing, then=Value(True)), default=F('is_completed')),
+            status=Case(When(finishing, then=Value('completed')), default=F('status')),
+            completed_at=Case(When(finishing, then=Value(timezone.now())), default=F('completed_at')),
+        )
+    elif not completed:
+        # Un-completing a required lesson reopens a finished course
+        reopening = Q(completed_lessons__lte=required, is_completed=True)
+        changes.update(
+            is_completed=Case(When(reopening, then=Value(False)), default=F('is_completed')),
+            status=Case(When(reopening, status='completed', then=Value('active')), default=F('status')),
+            completed_at=Case(When(reopening, then=Value(None)), default=F('completed_at')),
+        )
+    Enrollment.objects.filter(pk=enrollment.pk).update(**changes)
+
+def record_lesson_start(enrollment, lesson_id):
+    """Log the first LessonProgress row for a lesson as a lesson_start event, after commit"""
+    transaction.on_commit(lambda: record_activity(
+        'lesson_start', user=enrollment.user_id, course=enrollment.course_id, lesson=lesson_id,
+    ))
+
+def advance_furthest_lesson(enrollment, lesson_id, content_version):
+    """Move Enrollment.furthest_lesson forward to ``lesson_id``, never backwards"""
+    sequence = get_lesson_sequence(enrollment.course_id, content_version)
+    position = sequence['positions'].get(lesson_id)
+    if position is None:
+        return
+    # Conditional UPDATE so concurrent completions can't regress the pointer;
+    # the negated lookup also matches a NULL pointer
+    Enrollment.objects.filter(pk=enrollment.pk).exclude(
+        furthest_lesson__in=sequence['ids'][position:]
+    ).update(furthest_lesson=lesson_id)
+
+def set_lesson_completed(progress, completed, must_complete):
+    """
+    Flip ``progress.completed`` and move the enrollment counters. The flip is
+    a conditional UPDATE, so concurrent requests can't count a lesson twice.
+    Returns True if the state changed.
+    """
+    completed_at = timezone.now() if completed else None
+    changed = LessonProgress.objects.filter(pk=progress.pk, completed=not completed).update(
+        completed=completed, completed_at=completed_at
+    )
+    if changed:
+        progress.completed, progress.completed_at = completed, completed_at
+        enrollment = progress.enrollment
+        course = Course.objects.filter(pk=enrollment.course_id).values('required_lessons', 'content_version').first()
+        if must_complete:
+            record_lesson_completion(enrollment, completed, course['required_lessons'])
+        if completed:
+            advance_furthest_lesson(enrollment, progress.lesson_id, course['content_version'])
+            # Queued only once the caller's transaction commits, so a rollback leaves no event
+            transaction.on_commit(lambda: record_activity(
+                'lesson_complete', user=enrollment.user_id, course=enrollment.course_id, lesson=progress.lesson_id,
+            ))
+        # Counter UPDATEs skip post_save, so drop the learner's dashboard here
+        invalidate_dashboard(enrollment.user_id)
+    return bool(changed)
+
+def reconcile_progress(course_ids=None):
+    """Recompute required and completed lesson counters from rows to correct drift"""
+    courses = Course.objects.all() if course_ids is None else Course.objects.filter(pk__in=course_ids)
+    required = Lesson.objects.filter(module__course=OuterRef('pk'), must_complete=True).order_by().values('module__course')
+    courses.update(required_lessons=Coalesce(Subquery(required.annotate(n=Count('id')).values('n')), Value(0)))
+
+    enrollments = Enrollment.objects.all() if course_ids is None else Enrollment.objects.filter(course__in=course_ids)
+    completed = LessonProgress.objects.filter(
+        enrollment=OuterRef('pk'), completed=True, lesson__must_complete=True
+    ).order_by().values('enrollment')
+    enrollments.update(completed_lessons=Coalesce(Subquery(completed.annotate(n=Count('id')).values('n')), Value(0)))
+
+    course_required = Subquery(Course.objects.filter(pk=OuterRef('course_id')).order_by().values('required_lessons'))
+    return enrollments.update(progress_percentage=_percentage(F('completed_lessons'), course_required))
+
+def sync_required_lessons(course_id):
+    """Recount a course's required lessons; enrollments are only touched when the count moved"""
+    required = Lesson.objects.filter(module__course=course_id, must_complete=True).count()
+    if Course.objects.filter(pk=course_id).exclude(required_lessons=required).update(required_lessons=required):
+        reconcile_progress([course_id])
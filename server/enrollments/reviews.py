@@ -0,0 +1,60 @@
+# enrollments/reviews.py
+from django.db import transaction
+from django.db.models import Avg, Case, Count, F, FloatField, OuterRef, Subquery, Value, When
+from django.db.models.functions import Coalesce, Now
+from courses.models import Course
+from courses.rankings import refresh_rankings
+from .models import CourseReview
+
+# Each helper is one UPDATE whose SET clauses all read the pre-update row,
+# so concurrent reviews of the same course can't lose each other's change.
+# updated_at moves with the ratings so course detail validators notice.
+
+def _apply(course_id, **changes):
+    Course.objects.filter(pk=course_id).update(updated_at=Now(), **changes)
+    transaction.on_commit(refresh_rankings)
+
+def review_added(course_id, rating):
+    _apply(
+        course_id,
+        average_rating=(F('average_rating') * F('total_reviews') + rating) / (F('total_reviews') + 1.0),
+        total_reviews=F('total_reviews') + 1,
+    )
+
+def review_changed(course_id, old_rating, new_rating):
+    if old_rating == new_rating:
+        return
+    _apply(
+        course_id,
+        average_rating=Case(
+            When(total_reviews__gt=0, then=F('average_rating') + (new_rating - old_rating) / (F('total_reviews') * 1.0)),
+            default=Value(float(new_rating)),
+            output_field=FloatField(),
+        ),
+    )
+
+def review_removed(course_id, rating):
+    _apply(
+        course_id,
+        average_rating=Case(
+            When(total_reviews__gt=1, then=(F('average_rating') * F('total_reviews') - rating) / (F('total_reviews') - 1.0)),
+            default=Value(0.0),
+            output_field=FloatField(),
+        ),
+        total_reviews=Case(
+            When(total_reviews__gt=0, then=F('total_reviews') - 1),
+            default=Value(0),
+        ),
+    )
+
+def reconcile_ratings(course_ids=None):
+    """Recompute average/count from CourseReview in one UPDATE to correct drift"""
+    reviews = CourseReview.objects.filter(course=OuterRef('pk')).order_by().values('course')
+    courses = Course.objects.all() if course_ids is None else Course.objects.filter(pk__in=course_ids)
+    updated = courses.update(
+        average_rating=Coalesce(Subquery(reviews.annotate(avg=Avg('rating')).values('avg')), Value(0.0), output_field=FloatField()),
+        total_reviews=Coalesce(Subquery(reviews.annotate(n=Count('id')).values('n')), Value(0)),
+        updated_at=Now(),
+    )
+    refresh_rankings()
+    return updated
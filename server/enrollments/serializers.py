@@ -1,9 +1,28 @@
 from rest_framework import serializers
-from .models import Enrollment, LessonProgress, QuizAttempt
-from courses.serializers import CourseSerializer, LessonSerializer, QuizSerializer
+from django.conf import settings
+from django.db import transaction
+from analytics.ingest import record_activity
+from .counters import record_enrollment
+from .models import Enrollment, LessonProgress, QuizAttempt, CourseReview
+from .progress import set_lesson_completed
+from courses.serializers import CourseSerializer, CourseSummarySerializer, LessonSerializer, QuizSerializer
 from user.serializers import UserSerializer
 
+class EnrollmentListSerializer(serializers.ModelSerializer):
+    """Compact list representation; pair with Enrollment.objects.for_list()"""
+    course = CourseSummarySerializer(read_only=True)
+    
+    class Meta:
+        model = Enrollment
+        fields = [
+            'id', 'user', 'course', 'enrolled_at', 'completed_at',
+            'progress_percentage', 'completed_lessons', 'is_completed', 'last_accessed_at',
+            'status'
+        ]
+        read_only_fields = fields
+
 class EnrollmentSerializer(serializers.ModelSerializer):
+    """Nested user and full course; pair with Enrollment.objects.for_detail()"""
     course = CourseSerializer(read_only=True)
     user = UserSerializer(read_only=True)
     
@@ -23,9 +42,18 @@ class LessonProgressSerializer(serializers.ModelSerializer):
         model = LessonProgress
         fields = [
             'id', 'enrollment', 'lesson', 'completed', 'completed_at',
-            'score', 'time_spent', 'last_accessed_at'
+            'score', 'time_spent', 'last_position', 'last_accessed_at'
         ]
-        read_only_fields = ['completed_at', 'last_accessed_at']
+        read_only_fields = ['completed_at', 'last_position', 'last_accessed_at']
+
+class HeartbeatEventSerializer(serializers.Serializer):
+    lesson = serializers.IntegerField()
+    seconds = serializers.IntegerField(min_value=0)
+    position = serializers.IntegerField(min_value=0, required=False, allow_null=True)
+
+class LessonHeartbeatSerializer(serializers.Serializer):
+    enrollment = serializers.IntegerField()
+    events = HeartbeatEventSerializer(many=True, allow_empty=False, max_length=settings.LESSON_HEARTBEAT_MAX_EVENTS)
 
 class QuizAttemptSerializer(serializers.ModelSerializer):
     quiz = QuizSerializer(read_only=True)
@@ -36,7 +64,24 @@ class QuizAttemptSerializer(serializers.ModelSerializer):
             'id', 'enrollment', 'quiz', 'score', 'passed',
             'attempt_number', 'started_at', 'completed_at', 'time_taken'
         ]
-        read_only_fields = ['started_at']
+        # Attempts are created by grading a submission, never from client-posted scores
+        read_only_fields = fields
+
+class QuizEnrollmentSerializer(serializers.Serializer):
+    enrollment = serializers.PrimaryKeyRelatedField(queryset=Enrollment.objects.all())
+    quiz = serializers.IntegerField()
+    
+    def validate_enrollment(self, enrollment):
+        if enrollment.user_id != self.context['request'].user.id:
+            raise serializers.ValidationError('You can only take quizzes in your own enrollments.')
+        return enrollment
+
+class QuizStartSerializer(QuizEnrollmentSerializer):
+    shuffle = serializers.BooleanField(default=False)
+
+class QuizSubmissionSerializer(QuizEnrollmentSerializer):
+    answers = serializers.DictField(child=serializers.JSONField())
+    token = serializers.CharField(required=False, allow_blank=True)
 
 class CreateEnrollmentSerializer(serializers.ModelSerializer):
     class Meta:
@@ -51,11 +96,11 @@ class CreateEnrollmentSerializer(serializers.ModelSerializer):
         if Enrollment.objects.filter(user=user, course=course).exists():
             raise serializers.ValidationError('Already enrolled in this course.')
         
-        enrollment = Enrollment.objects.create(user=user, course=course)
-        
-        # Update course enrollment count
-        course.total_enrollments += 1
-        course.save()
+        # Count on a counter shard; totals are folded into the course later
+        with transaction.atomic():
+            enrollment = Enrollment.objects.create(user=user, course=course)
+            record_enrollment(course.id)
+        record_activity('course_enroll', user=user, course=course, request=self.context['request'])
         
         return enrollment
 
@@ -65,30 +110,33 @@ class UpdateLessonProgressSerializer(serializers.ModelSerializer):
         fields = ['completed', 'score', 'time_spent']
     
     def update(self, instance, validated_data):
-        completed = validated_data.get('completed', instance.completed)
-        
-        if completed and not instance.completed:
-            instance.completed_at = serializers.DateTimeField().to_representation(serializers.DateTimeField().to_internal_value(None))
-        
-        instance.completed = completed
-        instance.score = validated_data.get('score', instance.score)
-        instance.time_spent = validated_data.get('time_spent', instance.time_spent)
-        
-        instance.save()
-        
-        # Update enrollment progress
-        enrollment = instance.enrollment
-        total_lessons = enrollment.course.lessons.count()
-        completed_lessons = enrollment.lesson_progress.filter(completed=True).count()
-        
-        if total_lessons > 0:
-            enrollment.progress_percentage = (completed_lessons / total_lessons) * 100
+        with transaction.atomic():
+            instance.score = validated_data.get('score', instance.score)
+            instance.time_spent = validated_data.get('time_spent', instance.time_spent)
+            instance.save(update_fields=['score', 'time_spent', 'last_accessed_at'])
             
-            # Check if course is completed
-            if completed_lessons == total_lessons:
-                enrollment.is_completed = True
-                enrollment.status = 'completed'
-        
-        enrollment.save()
+            # Moves the enrollment's counters in one UPDATE instead of recounting the course
+            if 'completed' in validated_data:
+                set_lesson_completed(instance, validated_data['completed'], instance.lesson.must_complete)
         
-        return instance
\ No newline at end of file
+        return instance
+
+class CourseReviewSerializer(serializers.ModelSerializer):
+    username = serializers.CharField(source='user.username', read_only=True)
+    
+    class Meta:
+        model = CourseReview
+        fields = [
+            'id', 'enrollment', 'course', 'username', 'rating', 'comment',
+            'created_at', 'updated_at'
+        ]
+        read_only_fields = ['course', 'created_at', 'updated_at']
+    
+    def validate_enrollment(self, enrollment):
+        if enrollment.user_id != self.context['request'].user.id:
+            raise serializers.ValidationError('You can only review your own enrollments.')
+        if self.instance is None and CourseReview.objects.filter(enrollment=enrollment).exists():
+            raise serializers.ValidationError('This enrollment already has a review.')
+        if self.instance is not None and enrollment.id != self.instance.enrollment_id:
+            raise serializers.ValidationError('A review cannot be moved to another enrollment.')
+        return enrollment
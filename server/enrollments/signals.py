@@ -0,0 +1,27 @@
+# enrollments/signals.py
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from courses.models import Course, Module, Lesson
+from .counters import record_enrollment
+from .models import Enrollment
+from .progress import sync_required_lessons
+
+@receiver(post_save, sender=Lesson)
+@receiver(post_delete, sender=Lesson)
+def sync_required_lessons_for_lesson(sender, instance, **kwargs):
+    # Resolve the course now; after commit a cascaded delete has removed the module
+    course_id = Module.objects.filter(pk=instance.module_id).values_list('course_id', flat=True).first()
+    if course_id is not None:
+        transaction.on_commit(lambda: sync_required_lessons(course_id))
+
+@receiver(post_delete, sender=Enrollment)
+def record_unenrollment(sender, instance, **kwargs):
+    course_id = instance.course_id
+    
+    def record():
+        # Deleting a course cascades here too; its counters are gone with it
+        if Course.objects.filter(pk=course_id).exists():
+            record_enrollment(course_id, -1)
+    
+    transaction.on_commit(record)
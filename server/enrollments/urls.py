@@ -6,6 +6,7 @@ router = DefaultRouter()
 router.register(r'enrollments', views.EnrollmentViewSet, basename='enrollment')
 router.register(r'lesson-progress', views.LessonProgressViewSet, basename='lessonprogress')
 router.register(r'quiz-attempts', views.QuizAttemptViewSet, basename='quizattempt')
+router.register(r'reviews', views.CourseReviewViewSet, basename='coursereview')
 
 urlpatterns = [
     path('', include(router.urls)),
@@ -1,15 +1,29 @@
-from rest_framework import viewsets, status, filters
+from rest_framework import viewsets, status, filters, serializers
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
 from django_filters.rest_framework import DjangoFilterBackend
 from django.shortcuts import get_object_or_404
-from .models import Enrollment, LessonProgress, QuizAttempt
+from django.utils import timezone
+from .models import Enrollment, LessonProgress, QuizAttempt, CourseReview
+from .grading import start_attempt, submit_quiz
+from .heartbeats import buffer as heartbeat_buffer
+from .progress import record_lesson_start, set_lesson_completed
+from .reviews import review_added, review_changed, review_removed
 from .serializers import (
-    EnrollmentSerializer, LessonProgressSerializer, QuizAttemptSerializer,
-    CreateEnrollmentSerializer, UpdateLessonProgressSerializer
+    EnrollmentSerializer, EnrollmentListSerializer, LessonProgressSerializer, QuizAttemptSerializer,
+    CreateEnrollmentSerializer, UpdateLessonProgressSerializer, CourseReviewSerializer,
+    QuizEnrollmentSerializer, QuizStartSerializer, QuizSubmissionSerializer, LessonHeartbeatSerializer
 )
+from analytics.dashboard import continue_learning_cards, enrollment_summary
+from analytics.ingest import record_activity
+from courses.curriculum import get_curriculum, get_lesson_sequence, resume_point
 from courses.models import Course, Lesson, Quiz
+from courses.quiz_payload import get_quiz_payload, shuffle_quiz_payload
+from core.pagination import EnrolledAtKeysetPagination
 
 class EnrollmentViewSet(viewsets.ModelViewSet):
     serializer_class = EnrollmentSerializer
@@ -17,17 +31,29 @@ class EnrollmentViewSet(viewsets.ModelViewSet):
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
     filterset_fields = ['course', 'status', 'is_completed']
     search_fields = ['course__title']
+    pagination_class = EnrolledAtKeysetPagination
     
     def get_queryset(self):
         # Users can only see their own enrollments
         # Admins can see all enrollments
-        if self.request.user.is_staff:
-            return Enrollment.objects.all()
-        return Enrollment.objects.filter(user=self.request.user)
+        queryset = Enrollment.objects.all()
+        if not self.request.user.is_staff:
+            queryset = queryset.filter(user=self.request.user)
+        if self.action == 'list' and not self.expand_detail():
+            return queryset.for_list()
+        if self.action in ['list', 'retrieve']:
+            return queryset.for_detail()
+        return queryset
+    
+    def expand_detail(self):
+        """Lists stay compact unless ?expand=course asks for the nested representation"""
+        return self.request.query_params.get('expand') == 'course'
     
     def get_serializer_class(self):
         if self.action == 'create':
             return CreateEnrollmentSerializer
+        if self.action == 'list' and not self.expand_detail():
+            return EnrollmentListSerializer
         return EnrollmentSerializer
     
     def perform_create(self, serializer):
@@ -53,17 +79,36 @@ class EnrollmentViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def stats(self, request):
         """Get enrollment statistics for user"""
-        user_enrollments = Enrollment.objects.filter(user=request.user)
-        
-        total_enrollments = user_enrollments.count()
-        completed_courses = user_enrollments.filter(is_completed=True).count()
-        in_progress = user_enrollments.filter(is_completed=False).count()
-        
+        stats = enrollment_summary(request.user)
+        return Response({
+            'total_enrollments': stats['total_enrollments'],
+            'completed_courses': stats['completed_courses'],
+            'in_progress': stats['in_progress']
+        })
+    
+    @action(detail=True, methods=['get'])
+    def resume(self, request, pk=None):
+        """Next lesson after the furthest completed one: one enrollment lookup plus the cached sequence"""
+        enrollment = get_object_or_404(
+            self.get_queryset().select_related('course').only('id', 'furthest_lesson', 'course__content_version'),
+            pk=pk,
+        )
+        sequence = get_lesson_sequence(enrollment.course.id, enrollment.course.content_version)
+        position, lesson = resume_point(sequence, enrollment.furthest_lesson_id)
         return Response({
-            'total_enrollments': total_enrollments,
-            'completed_courses': completed_courses,
-            'in_progress': in_progress
+            'enrollment': enrollment.id,
+            'course': enrollment.course.id,
+            'lesson': lesson,
+            'position': position,
+            'total_lessons': len(sequence['lessons']),
         })
+    
+    @action(detail=False, methods=['get'], url_path='continue')
+    def continue_learning(self, request):
+        """Resume cards for the user's unfinished enrollments, most recently accessed first"""
+        limit = request.query_params.get('limit', '')
+        limit = min(int(limit), 50) if limit.isdigit() else 10
+        return Response(continue_learning_cards(request, request.user, limit))
 
 class LessonProgressViewSet(viewsets.ModelViewSet):
     serializer_class = LessonProgressSerializer
@@ -85,7 +130,6 @@ class LessonProgressViewSet(viewsets.ModelViewSet):
         """Create or update lesson progress"""
         enrollment_id = request.data.get('enrollment')
         lesson_id = request.data.get('lesson')
-        completed = request.data.get('completed', False)
         
         # Get enrollment
         enrollment = get_object_or_404(Enrollment, id=enrollment_id, user=request.user)
@@ -100,19 +144,71 @@ class LessonProgressViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        # Only the fields sent are written. time_spent is added in the
+        # UPDATE itself, so it neither wipes what heartbeats accumulated nor
+        # races a concurrent flush
+        fields = {
+            'score': serializers.FloatField(allow_null=True),
+            'time_spent': serializers.IntegerField(min_value=0, max_value=settings.LESSON_HEARTBEAT_MAX_REQUEST_SECONDS),
+            'completed': serializers.BooleanField(),
+        }
+        values, errors = {}, {}
+        for name, field in fields.items():
+            if name in request.data:
+                try:
+                    values[name] = field.run_validation(request.data[name])
+                except serializers.ValidationError as exc:
+                    errors[name] = exc.detail
+        if errors:
+            raise serializers.ValidationError(errors)
+        completed = values.pop('completed', None)
+        if 'time_spent' in values:
+            values['time_spent'] = F('time_spent') + values['time_spent']
+        
         # Create or update progress
-        progress, created = LessonProgress.objects.update_or_create(
-            enrollment=enrollment,
-            lesson=lesson,
-            defaults={
-                'completed': completed,
-                'score': request.data.get('score'),
-                'time_spent': request.data.get('time_spent', 0)
-            }
-        )
+        with transaction.atomic():
+            progress, created = LessonProgress.objects.get_or_create(enrollment=enrollment, lesson=lesson)
+            if created:
+                record_lesson_start(enrollment, lesson.id)
+            LessonProgress.objects.filter(pk=progress.pk).update(last_accessed_at=timezone.now(), **values)
+            progress.refresh_from_db(fields=['score', 'time_spent', 'last_accessed_at'])
+            if completed is not None:
+                set_lesson_completed(progress, completed, lesson.must_complete)
         
         serializer = self.get_serializer(progress)
         return Response(serializer.data, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
+    
+    @action(detail=False, methods=['post'])
+    def heartbeat(self, request):
+        """
+        Buffer a batch of player events; time_spent and position reach
+        LessonProgress on the next flush, not during this request
+        """
+        serializer = LessonHeartbeatSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        enrollment = get_object_or_404(
+            Enrollment.objects.select_related('course').only('id', 'course__content_version'),
+            id=serializer.validated_data['enrollment'],
+            user=request.user,
+        )
+        
+        # Lesson membership comes from the cached outline, so the only query is the enrollment lookup
+        curriculum = get_curriculum(enrollment.course.id, enrollment.course.content_version)
+        lesson_ids = {lesson['id'] for module in curriculum['modules'] for lesson in module['lessons']}
+        
+        # Each event and the request as a whole are capped, so a crafted
+        # batch can't credit more watch time than a real player would
+        budget = settings.LESSON_HEARTBEAT_MAX_REQUEST_SECONDS
+        accepted = 0
+        for event in serializer.validated_data['events']:
+            if event['lesson'] not in lesson_ids:
+                continue
+            seconds = min(event['seconds'], settings.LESSON_HEARTBEAT_MAX_DELTA, budget)
+            budget -= seconds
+            heartbeat_buffer.add(enrollment.id, event['lesson'], seconds, event.get('position'))
+            accepted += 1
+        
+        return Response({'accepted': accepted}, status=status.HTTP_202_ACCEPTED)
 
 class QuizAttemptViewSet(viewsets.ModelViewSet):
     queryset = QuizAttempt.objects.all()
@@ -120,11 +216,127 @@ class QuizAttemptViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['enrollment', 'quiz', 'passed']
+    # Attempts only come from graded submissions and are never edited
+    http_method_names = ['get', 'post', 'head', 'options']
     
     def get_queryset(self):
         if self.request.user.is_staff:
             return QuizAttempt.objects.all()
         return QuizAttempt.objects.filter(enrollment__user=self.request.user)
     
+    def create(self, request, *args, **kwargs):
+        return self.submit(request)
+    
+    @action(detail=False, methods=['get'])
+    def summary(self, request):
+        """Latest and best attempt for ?enrollment=&quiz=, each one index probe"""
+        serializer = QuizEnrollmentSerializer(data=request.query_params, context={'request': request})
+        serializer.is_valid(raise_exception=True)
+        attempts = QuizAttempt.objects.filter(
+            enrollment=serializer.validated_data['enrollment'], quiz=serializer.validated_data['quiz']
+        ).only('id', 'attempt_number', 'score', 'passed', 'completed_at', 'time_taken')
+        
+        def describe(attempt):
+            if attempt is None:
+                return None
+            return {
+                'id': attempt.id,
+                'attempt_number': attempt.attempt_number,
+                'score': attempt.score,
+                'passed': attempt.passed,
+                'completed_at': attempt.completed_at,
+                'time_taken': attempt.time_taken,
+            }
+        
+        latest = attempts.order_by('-attempt_number').first()
+        return Response({
+            'attempts': latest.attempt_number if latest else 0,
+            'latest': describe(latest),
+            'best': describe(attempts.order_by('-score', '-id').first()),
+        })
+    
+    @action(detail=False, methods=['post'])
+    def start(self, request):
+        """
+        Open an attempt and return its single-use start token (timed quizzes
+        must be submitted with it) together with the quiz, shuffled per
+        attempt when ``shuffle`` is set. This is the only place a timed
+        quiz's questions are served to learners.
+        """
+        serializer = QuizStartSerializer(data=request.data, context={'request': request})
+        serializer.is_valid(raise_exception=True)
+        attempt, token, answer_key = start_attempt(serializer.validated_data['enrollment'], serializer.validated_data['quiz'])
+        quiz = get_quiz_payload(answer_key['quiz_id'])
+        if serializer.validated_data['shuffle']:
+            quiz = shuffle_quiz_payload(quiz, token)
+        return Response({
+            'token': token,
+            'attempt_number': attempt.attempt_number,
+            'started_at': attempt.started_at,
+            'time_limit': answer_key['time_limit'],
+            'quiz': quiz,
+        })
+    
+    @action(detail=False, methods=['post'])
+    def submit(self, request):
+        """Grade the submitted answers and record the attempt"""
+        serializer = QuizSubmissionSerializer(data=request.data, context={'request': request})
+        serializer.is_valid(raise_exception=True)
+        attempt, results, answer_key = submit_quiz(
+            serializer.validated_data['enrollment'],
+            serializer.validated_data['quiz'],
+            serializer.validated_data['answers'],
+            serializer.validated_data.get('token'),
+        )
+        max_attempts = answer_key['max_attempts']
+        record_activity(
+            'quiz_attempt', user=request.user, course=answer_key['course_id'], request=request,
+            quiz=attempt.quiz_id, score=attempt.score, passed=attempt.passed,
+        )
+        return Response({
+            'id': attempt.id,
+            'attempt_number': attempt.attempt_number,
+            'score': attempt.score,
+            'passed': attempt.passed,
+            'time_taken': attempt.time_taken,
+            'attempts_remaining': max(max_attempts - attempt.attempt_number, 0) if max_attempts else None,
+            'results': results,
+        }, status=status.HTTP_201_CREATED)
+
+class CourseReviewViewSet(viewsets.ModelViewSet):
+    serializer_class = CourseReviewSerializer
+    permission_classes = [IsAuthenticatedOrReadOnly]
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['course', 'rating']
+    
+    def get_queryset(self):
+        queryset = CourseReview.objects.select_related('user')
+        # Reviews are public to read; only the author (or staff) may change one
+        if self.action in ['update', 'partial_update', 'destroy'] and not self.request.user.is_staff:
+            queryset = queryset.filter(user=self.request.user)
+        return queryset
+    
     def perform_create(self, serializer):
-        serializer.save()
\ No newline at end of file
+        enrollment = serializer.validated_data['enrollment']
+        try:
+            with transaction.atomic():
+                review = serializer.save(user=self.request.user, course_id=enrollment.course_id)
+                review_added(review.course_id, review.rating)
+        except IntegrityError:
+            # A concurrent request created the review after validation passed
+            raise serializers.ValidationError({'enrollment': ['This enrollment already has a review.']})
+    
+    def perform_update(self, serializer):
+        with transaction.atomic():
+            # Lock the row so the rating we subtract is the one being replaced
+            old_rating = CourseReview.objects.select_for_update().values_list(
+                'rating', flat=True
+            ).get(pk=serializer.instance.pk)
+            review = serializer.save()
+            review_changed(review.course_id, old_rating, review.rating)
+    
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            deleted, _ = CourseReview.objects.filter(pk=instance.pk).delete()
+            if deleted:
+                review_removed(instance.course_id, instance.rating)
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.9 on 2026-10-18 02:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organization', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='organization',
+            name='logo_digest',
+            field=models.CharField(blank=True, editable=False, max_length=16),
+        ),
+    ]
@@ -6,6 +6,7 @@ class Organization(models.Model):
     name = models.CharField(max_length=200)
     domain = models.CharField(max_length=100, unique=True)
     logo = models.ImageField(upload_to='organization_logos/', null=True, blank=True)
+    logo_digest = models.CharField(max_length=16, blank=True, editable=False)  # see core.images
     primary_color = models.CharField(max_length=7, default='#667eea')  # Hex color
     secondary_color = models.CharField(max_length=7, default='#764ba2')
     created_at = models.DateTimeField(auto_now_add=True)
@@ -2,12 +2,15 @@ from rest_framework import serializers
 from .models import Organization, OrganizationMember, OrganizationEnrollment
 from user.serializers import UserSerializer
 from courses.serializers import CourseSerializer
+from core.fields import ImageVariantsField
 
 class OrganizationSerializer(serializers.ModelSerializer):
+    logo_variants = ImageVariantsField('logo')
+    
     class Meta:
         model = Organization
         fields = [
-            'id', 'name', 'domain', 'logo', 
+            'id', 'name', 'domain', 'logo', 'logo_variants',
             'primary_color', 'secondary_color',
             'created_at', 'updated_at'
         ]
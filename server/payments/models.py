@@ -31,6 +31,10 @@ class Payment(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at', '-id']),
+            models.Index(fields=['-created_at', '-id']),
+        ]
     
     def __str__(self):
         return f"Payment {self.transaction_id} - {self.user.username} - ${self.amount}"
\ No newline at end of file
@@ -6,6 +6,7 @@ from rest_framework.permissions import IsAuthenticated
 from django.shortcuts import get_object_or_404
 from django.conf import settings
 import logging
+from core.pagination import CreatedAtKeysetPagination
 from .models import Payment
 from .serializers import PaymentSerializer, CreatePaymentSerializer
 
@@ -38,6 +39,7 @@ except Exception as e:
 class PaymentViewSet(viewsets.ModelViewSet):
     serializer_class = PaymentSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = CreatedAtKeysetPagination
     
     def get_queryset(self):
         if self.request.user.is_staff:
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.9 on 2026-10-18 02:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0004_alter_users_managers'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='users',
+            name='profile_picture_digest',
+            field=models.CharField(blank=True, editable=False, max_length=16),
+        ),
+    ]
@@ -2,14 +2,19 @@
 from rest_framework import serializers
 from django.contrib.auth import authenticate
 from rest_framework_simplejwt.tokens import RefreshToken
+from core.fields import ImageVariantsField
 from .models import Users
 import sys
 
 class UserSerializer(serializers.ModelSerializer):
+    profile_picture_variants = ImageVariantsField('profile_picture')
+    
     class Meta:
         model = Users
         fields = ['id', 'username', 'email', 'first_name', 'last_name', 
-                  'phone', 'department', 'is_admin', 'is_staff', 'date_joined']
+                  'phone', 'department', 'is_admin', 'is_staff', 'date_joined',
+                  'profile_picture', 'profile_picture_variants']
+        read_only_fields = ['profile_picture']
 
 class RegisterSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, min_length=8)
@@ -6,6 +6,7 @@ from rest_framework_simplejwt.tokens import RefreshToken, AccessToken
 from rest_framework_simplejwt.exceptions import TokenError
 from django.contrib.auth import authenticate, login, logout
 from django.utils import timezone
+from analytics.ingest import record_activity
 from .models import Users
 from .serializers import UserSerializer, RegisterSerializer, LoginSerializer, AdminRegisterSerializer, TokenRefreshSerializer
 
@@ -107,6 +108,7 @@ class LoginView(APIView):
             
             user.last_login = timezone.now()
             user.save()
+            record_activity('login', user=user, request=request)
             
             user_data = UserSerializer(user).data
             
@@ -215,6 +217,7 @@ class LogoutView(APIView):
             # Token might already be blacklisted or invalid
             pass
         
+        record_activity('logout', user=request.user, request=request)
         logout(request)
         return Response({'message': 'Logged out successfully'})
 